@@ -1,27 +1,184 @@
-from fastapi import APIRouter, HTTPException, status, Depends
-from schemas.todo_schema import TodoCreate, TodoDetail, TodoUpdate
+from fastapi import APIRouter, HTTPException, status, Depends, Request, Query, UploadFile, File, Header
+from fastapi.responses import StreamingResponse
+from schemas.todo_schema import TodoCreate, TodoDetail, TodoUpdate, TodoBatchGet, TodoBatchResult, TodoListQuery, TodoSort
 from models.user_model import User
 from api.dependencies.user_deps import get_current_user # Função de dependência para obter o usuário atual, autenticado
-from services.todo_service import TodoService
-from models.todo_model import Todo
-from typing import List
+from services.todo_service import TodoService, IMPORT_FORMATS
+from api.responses import negotiated_response, NEGOTIATED_RESPONSES
+from api.idempotency import (
+    IDEMPOTENCY_HEADER, IDEMPOTENCY_RESPONSES, NDJSON_MEDIA_TYPE,
+    idempotency_error, idempotent_ndjson, idempotent_response, request_fingerprint, stored_response,
+)
+from services.idempotency_service import IdempotencyConflict, IdempotencyService
+from starlette.concurrency import run_in_threadpool
+from typing import List, Optional
+from datetime import datetime
+import hashlib
+import json
 from uuid import UUID
+from core.profiling import get_route_class
 
 
 
-todo_router = APIRouter()
+todo_router = APIRouter(route_class=get_route_class())
 
 # Em java o código seria como abaixo:
 # @RestController 
 # @RequestMapping("/api/v1/todo")
-@todo_router.get("/", summary="Listar tarefas (todos)", response_model=List[TodoDetail], status_code=status.HTTP_200_OK)
-async def list_todos(current_user: User = Depends(get_current_user)):
-    # Aqui você implementaria a lógica para listar as tarefas do usuário
-    return await TodoService.list_todos(current_user)
+@todo_router.get("/", summary="Listar tarefas (todos)", response_model=List[TodoDetail], status_code=status.HTTP_200_OK,
+                 responses=NEGOTIATED_RESPONSES)
+async def list_todos(
+    request: Request,
+    status_filter: Optional[bool] = Query(None, alias="status"),  # Filtra por status (true = concluídas)
+    created_after: Optional[datetime] = None,  # Criadas a partir desta data
+    created_before: Optional[datetime] = None,  # Criadas antes desta data
+    sort: Optional[TodoSort] = None,  # Ex.: "-created_at" (mais recentes primeiro)
+    current_user: User = Depends(get_current_user)
+):
+    query = TodoListQuery(
+        status=status_filter,
+        created_after=created_after,
+        created_before=created_before,
+        sort=sort
+    )
+    try:
+        todos = await TodoService.list_todos(current_user, query)
+    except ValueError as e:
+        # Combinação de filtro e ordenação sem índice declarado
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    # A lista pode ser grande: a resposta é negociada (JSON/MessagePack, gzip/br)
+    return await negotiated_response(request, todos, List[TodoDetail])
+
+# Cabeçalho opcional das rotas de escrita: repetições com a mesma chave recebem a resposta guardada
+IdempotencyKey = Header(
+    None,
+    alias=IDEMPOTENCY_HEADER,
+    max_length=255,
+    description="Chave única por operação; repetições com a mesma chave não executam a escrita de novo",
+)
+
+
+@todo_router.post("/create", summary="Criar nova tarefa (todo)", response_model=TodoDetail, status_code=status.HTTP_201_CREATED,
+                  responses=IDEMPOTENCY_RESPONSES)
+async def create_todo(
+    request: Request,
+    data: TodoCreate,
+    current_user: User = Depends(get_current_user),
+    idempotency_key: Optional[str] = IdempotencyKey
+):
+    if idempotency_key is None:
+        return await TodoService.create_todo(current_user, data)
+    return await idempotent_response(
+        request, current_user, idempotency_key, data.model_dump_json(),
+        lambda: TodoService.create_todo(current_user, data),
+        TodoDetail, status.HTTP_201_CREATED
+    )
+
+
+def _import_format(file: UploadFile) -> Optional[str]:
+    # Descobre o formato pela extensão do arquivo ou pelo content type
+    filename = (file.filename or "").lower()
+    content_type = (file.content_type or "").lower()
+    if filename.endswith(".csv") or content_type == "text/csv":
+        return "csv"
+    if filename.endswith((".ndjson", ".jsonl")) or content_type in ("application/x-ndjson", "application/jsonl"):
+        return "ndjson"
+    return None
+
+
+def _file_digest(file) -> str:
+    digest = hashlib.sha256()
+    for chunk in iter(lambda: file.read(1024 * 1024), b""):
+        digest.update(chunk)
+    file.seek(0)
+    return digest.hexdigest()
+
+
+@todo_router.post(
+    "/import",
+    summary="Importar tarefas (todos) de um arquivo NDJSON ou CSV",
+    status_code=status.HTTP_200_OK,
+    response_class=StreamingResponse,
+    responses={200: {"content": {NDJSON_MEDIA_TYPE: {}}}, 422: IDEMPOTENCY_RESPONSES[422]}
+)
+async def import_todos(
+    request: Request,
+    file: UploadFile = File(..., description="Arquivo .ndjson/.jsonl (um objeto por linha) ou .csv com cabeçalho"),
+    current_user: User = Depends(get_current_user),
+    idempotency_key: Optional[str] = IdempotencyKey
+):
+    """
+    Importa muitas tarefas de uma vez a partir de um arquivo enviado.
+
+    Cada linha (ou registro do CSV, com as colunas title, description, status) é validada
+    como TodoCreate; as válidas são inseridas em lotes. O arquivo é lido em sequência,
+    então o uso de memória não depende do tamanho do arquivo.
+
+    Retorna:
+        Um stream NDJSON com um evento de progresso por lote e um evento final "done",
+        cada um com processed, inserted, failed e os erros das linhas do lote.
+
+    Com Idempotency-Key, uma repetição do mesmo arquivo recebe os eventos da importação
+    original (mesmo que ela tenha sido interrompida) em vez de importar de novo.
+
+    Erros:
+        415: Se o formato do arquivo não for NDJSON nem CSV.
+        422: Se o Idempotency-Key já foi usado com outro arquivo.
+    """
+    file_format = _import_format(file)
+    if file_format not in IMPORT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Envie um arquivo .ndjson, .jsonl ou .csv"
+        )
+
+    async def events(on_write=None):
+        async for event in TodoService.import_todos(current_user, file.file, file_format, on_write):
+            yield json.dumps(event, ensure_ascii=False) + "\n"
+
+    if idempotency_key is None:
+        return StreamingResponse(events(), media_type=NDJSON_MEDIA_TYPE)
+
+    # O arquivo já está em disco (spooled); o hash identifica o conteúdo enviado
+    digest = await run_in_threadpool(_file_digest, file.file)
+    request_hash = request_fingerprint(request, f"{file_format}:{digest}")
+    try:
+        record = await IdempotencyService.lookup(current_user, idempotency_key, request_hash)
+    except IdempotencyConflict as e:
+        raise idempotency_error(e)
+    if record is not None:
+        return stored_response(record, replayed=True)
+    return StreamingResponse(
+        idempotent_ndjson(current_user, idempotency_key, request_hash, events),
+        media_type=NDJSON_MEDIA_TYPE
+    )
+
+
+@todo_router.post(
+    "/batch-get",
+    summary="Detalhar várias tarefas (todos) por ID",
+    response_model=TodoBatchResult,
+    status_code=status.HTTP_200_OK
+)
+async def batch_get(
+    data: TodoBatchGet,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Recupera várias tarefas do usuário autenticado em uma única consulta.
+
+    Parâmetros:
+        data (TodoBatchGet): Lista de IDs (até settings.TODO_BATCH_MAX_IDS).
+        current_user (User): O usuário autenticado, injetado automaticamente.
 
-@todo_router.post("/create", summary="Criar nova tarefa (todo)", response_model=Todo, status_code=status.HTTP_201_CREATED)
-async def create_todo(data: TodoCreate, current_user: User = Depends(get_current_user)):
-    return await TodoService.create_todo(current_user, data)
+    Retorna:
+        TodoBatchResult: Tarefas encontradas na ordem pedida e os IDs não encontrados.
+    """
+    found, missing = await TodoService.detail_many(current_user, data.todo_ids)
+    return {"found": found, "missing": missing}
 
 
 @todo_router.get(
@@ -63,11 +220,14 @@ async def detail(
     "/{todo_id}",
     summary="Atualizar tarefa (todo) por ID",
     response_model=TodoDetail,
-    status_code=status.HTTP_200_OK)
+    status_code=status.HTTP_200_OK,
+    responses=IDEMPOTENCY_RESPONSES)
 async def update(
+    request: Request,
     todo_id: UUID,
     data: TodoUpdate,
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    idempotency_key: Optional[str] = IdempotencyKey
 ):
     """
     Atualiza uma tarefa existente pelo seu ID.
@@ -83,24 +243,35 @@ async def update(
     Erros:
     - 404: Se a tarefa não for encontrada.
     """
-    updated_todo = await TodoService.update(current_user, todo_id, data)
-    if not updated_todo:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Tarefa não encontrada"
-        )
-    return updated_todo
+    async def run_update():
+        updated_todo = await TodoService.update(current_user, todo_id, data)
+        if not updated_todo:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Tarefa não encontrada"
+            )
+        return updated_todo
+
+    if idempotency_key is None:
+        return await run_update()
+    return await idempotent_response(
+        request, current_user, idempotency_key, data.model_dump_json(),
+        run_update, TodoDetail, status.HTTP_200_OK
+    )
 # ...existing code...
 
 
 @todo_router.delete(
     "/{todo_id}",
     summary="Deletar tarefa (todo) por ID",
-    status_code=status.HTTP_204_NO_CONTENT
+    status_code=status.HTTP_204_NO_CONTENT,
+    responses=IDEMPOTENCY_RESPONSES
 )
 async def delete(
+    request: Request,
     todo_id: UUID,  # Recebe o ID da tarefa como parâmetro da rota
-    current_user: User = Depends(get_current_user)  # Injeta o usuário autenticado usando Depends
+    current_user: User = Depends(get_current_user),  # Injeta o usuário autenticado usando Depends
+    idempotency_key: Optional[str] = IdempotencyKey  # Com a chave, uma repetição recebe 204 em vez de 404
 ):
     """
     Delete a todo item by its ID.
@@ -112,15 +283,23 @@ async def delete(
     Returns:
        - None: Returns HTTP 204 No Content on successful deletion.
     """
-    # Chama o serviço para deletar a tarefa, passando o usuário atual e o ID da tarefa
-    deleted = await TodoService.delete(current_user, todo_id)
+    async def run_delete():
+        # Chama o serviço para deletar a tarefa, passando o usuário atual e o ID da tarefa
+        deleted = await TodoService.delete(current_user, todo_id)
 
-    # Se a tarefa não foi encontrada ou não pôde ser deletada
-    if not deleted:
-        # Lança uma exceção HTTP 404 (não encontrado) com uma mensagem personalizada
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Tarefa não encontrada"
+        # Se a tarefa não foi encontrada ou não pôde ser deletada
+        if not deleted:
+            # Lança uma exceção HTTP 404 (não encontrado) com uma mensagem personalizada
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Tarefa não encontrada"
+            )
+
+    if idempotency_key is not None:
+        return await idempotent_response(
+            request, current_user, idempotency_key, "",
+            run_delete, None, status.HTTP_204_NO_CONTENT
         )
+    await run_delete()
     # Retorna None explicitamente, indicando sucesso (HTTP 204 No Content)
     return None
\ No newline at end of file
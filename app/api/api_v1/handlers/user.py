@@ -1,12 +1,15 @@
 from fastapi import APIRouter, HTTPException, status, Depends
-from schemas.user_schema import UserAuth, UserDetail
+from pydantic import EmailStr
+from typing import Optional
+from schemas.user_schema import UserAuth, UserDetail, UserAvailability
 from services.user_service import UserService
 import pymongo
 from models.user_model import User
 from api.dependencies.user_deps import get_current_user
+from core.profiling import get_route_class
 
 
-user_router = APIRouter()
+user_router = APIRouter(route_class=get_route_class())
 
 
 @user_router.get("/test")
@@ -26,6 +29,22 @@ async def create_user(data:UserAuth):
     
 
 
+@user_router.get("/available", summary="Check username/email availability", response_model=UserAvailability)
+async def available(username: Optional[str] = None, email: Optional[EmailStr] = None):
+    """
+    Verifica se um username e/ou email ainda estão livres (usado na tela de cadastro).
+
+    A resposta vem de um filtro de Bloom em memória; só quando o filtro indica
+    que o valor talvez exista é feita uma consulta ao banco para confirmar.
+    """
+    if username is None and email is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Informe username e/ou email."
+        )
+    return await UserService.check_availability(username=username, email=email)
+
+
 @user_router.get("/me", summary="Get current user details", response_model=UserDetail)
 async def get_me(user: User = Depends(get_current_user)):
     """
@@ -1,8 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Body
+from fastapi import APIRouter, Depends, HTTPException, status, Body, Response
 from fastapi.security import OAuth2PasswordRequestForm
 from typing import Any
 from services.user_service import UserService
-from core.security import create_access_token, create_refresh_token
+from core.security import create_access_token, create_refresh_token, decode_refresh_token, jwks
 from schemas.auth_schema import TokenSchema
 from schemas.user_schema import UserDetail
 from models.user_model import User
@@ -11,10 +11,11 @@ from pydantic import ValidationError
 from core.config import settings
 from schemas.auth_schema import TokenPayload
 from jose import jwt
+from core.profiling import get_route_class
 
 
 
-auth_router = APIRouter()
+auth_router = APIRouter(route_class=get_route_class())
 
 
 @auth_router.post("/login", summary="Criação de token JWT e Refresh Token", response_model=TokenSchema)
@@ -81,11 +82,7 @@ async def test_token(user: User = Depends(get_current_user)):
 @auth_router.post("/refresh", summary="Refresh Token", response_model=TokenSchema)
 async def refresh_token(refresh_token: str = Body(...)):
     try:
-        payload = jwt.decode(
-            refresh_token,
-            settings.JWT_REFRESH_SECRET_KEY,
-            settings.ALGORITHM
-        )
+        payload = decode_refresh_token(refresh_token)
         token_data = TokenPayload(**payload)
     except (jwt.JWTError, ValidationError):
         raise HTTPException(
@@ -104,4 +101,17 @@ async def refresh_token(refresh_token: str = Body(...)):
     return {
         "access_token": create_access_token(user.user_id),
         "refresh_token": create_refresh_token(user.user_id)
-    }
\ No newline at end of file
+    }
+
+
+@auth_router.get("/jwks.json", summary="Chaves públicas (JWKS) para validar os access tokens")
+async def get_jwks(response: Response):
+    """
+    Publica as chaves públicas usadas na assinatura dos access tokens (RFC 7517).
+
+    Outros serviços validam nossos tokens com estas chaves, escolhendo pelo `kid`
+    do cabeçalho do token, sem precisar do segredo compartilhado nem chamar esta API.
+    Com algoritmo HS256 a lista vem vazia.
+    """
+    response.headers["Cache-Control"] = "public, max-age=300"
+    return jwks()
@@ -7,6 +7,7 @@ from schemas.auth_schema import TokenPayload
 from datetime import datetime
 from pydantic import ValidationError
 from services.user_service import UserService
+from core.security import decode_access_token
 
 
 # Cria um esquema OAuth2 reutilizável para autenticação via JWT.
@@ -26,12 +27,8 @@ oauth_reusavel = OAuth2PasswordBearer(
 # - Se válido, retorna os dados do usuário (aqui só valida o token, não busca o usuário no banco).
 async def get_current_user(token: str = Depends(oauth_reusavel)) -> User:
     try:
-        # Decodifica o token JWT usando a chave secreta e o algoritmo definidos nas configurações.
-        payload = jwt.decode(
-            token,
-            settings.JWT_SECRET_KEY,
-            settings.ALGORITHM
-        )
+        # Decodifica o token JWT usando a chave (secreta ou pública) e o algoritmo definidos nas configurações.
+        payload = decode_access_token(token)
         # Constrói o schema TokenPayload para validar e acessar os dados do token.
         token_data = TokenPayload(**payload)
         # Verifica se o token está expirado comparando o campo 'exp' com o horário atual.
@@ -0,0 +1,150 @@
+import json
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional
+
+from fastapi import HTTPException, Request, Response, status
+
+from api.responses import _adapter
+from models.idempotency_model import IdempotencyRecord
+from models.user_model import User
+from services.idempotency_service import (
+    IdempotencyConflict,
+    IdempotencyInProgress,
+    IdempotencyService,
+    fingerprint,
+)
+
+
+# Cabeçalho enviado pelo cliente nas escritas que podem ser repetidas
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+
+# Cabeçalho da resposta que indica que ela veio do armazenamento (a escrita não foi executada de novo)
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Documentação extra para as rotas com Idempotency-Key (aparece no Swagger UI)
+IDEMPOTENCY_RESPONSES = {
+    409: {"description": "Uma requisição com o mesmo Idempotency-Key ainda está em andamento."},
+    422: {"description": "O Idempotency-Key já foi usado com outro corpo ou rota."},
+}
+
+
+def request_fingerprint(request: Request, payload: str = "") -> str:
+    """
+    Identifica a requisição pelo método, rota e corpo já validado (`payload`).
+    """
+    return fingerprint(request.method, request.url.path, payload)
+
+
+def idempotency_error(error: Exception) -> HTTPException:
+    """
+    Converte os erros do IdempotencyService em respostas HTTP.
+    """
+    if isinstance(error, IdempotencyConflict):
+        return HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"{IDEMPOTENCY_HEADER} já usado com outra requisição"
+        )
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail=f"Uma requisição com o mesmo {IDEMPOTENCY_HEADER} ainda está em andamento"
+    )
+
+
+def stored_response(record: IdempotencyRecord, replayed: bool) -> Response:
+    """
+    Monta a resposta HTTP a partir da resposta guardada.
+    """
+    headers = {REPLAYED_HEADER: "true"} if replayed else {}
+    return Response(
+        content=record.body,
+        status_code=record.status_code,
+        headers=headers,
+        media_type=record.media_type,
+    )
+
+
+async def idempotent_response(
+    request: Request,
+    user: User,
+    key: str,
+    payload: str,
+    operation: Callable[[], Awaitable[Any]],
+    response_model: Optional[Any],
+    status_code: int,
+) -> Response:
+    """
+    Executa `operation` uma única vez por Idempotency-Key e devolve sempre a mesma resposta.
+
+    O resultado é serializado com `response_model` (como o FastAPI faria) e guardado;
+    sem `response_model` (ex.: 204 No Content) a resposta não tem corpo.
+    """
+    async def execute():
+        result = await operation()
+        if response_model is None:
+            return status_code, b"", None
+        adapter = _adapter(response_model)
+        body = adapter.dump_json(adapter.validate_python(result, from_attributes=True))
+        return status_code, body, "application/json"
+
+    try:
+        record, replayed = await IdempotencyService.run(
+            user, key, request_fingerprint(request, payload), execute
+        )
+    except (IdempotencyConflict, IdempotencyInProgress) as e:
+        raise idempotency_error(e)
+    return stored_response(record, replayed)
+
+
+async def idempotent_ndjson(
+    user: User,
+    key: str,
+    request_hash: str,
+    lines: Callable[[Callable[[], None]], AsyncIterator[str]],
+) -> AsyncIterator[str]:
+    """
+    Versão de `idempotent_response` para respostas NDJSON em stream.
+
+    `lines(on_write)` gera as linhas do stream e chama `on_write` antes de cada escrita.
+
+    A chave só é assumida quando o stream começa, então um stream que nunca é enviado
+    não a deixa presa. Se alguma escrita foi iniciada, as linhas enviadas são guardadas
+    no fim, mesmo se o cliente desconectar no meio (inclusive durante a primeira escrita):
+    o que já foi escrito não é escrito de novo na repetição. Um stream interrompido é
+    guardado com um evento final "interrupted". A chave só é liberada se nada foi escrito.
+    Como o status 200 já foi enviado, os erros de idempotência viram um evento "error".
+    """
+    try:
+        record = await IdempotencyService.begin(user, key, request_hash)
+    except (IdempotencyConflict, IdempotencyInProgress) as e:
+        yield json.dumps({"event": "error", "detail": idempotency_error(e).detail}, ensure_ascii=False) + "\n"
+        return
+    if record is not None:
+        yield record.body.decode("utf-8")
+        return
+
+    sent = []
+    written = finished = False
+
+    def on_write() -> None:
+        nonlocal written
+        written = True
+
+    try:
+        async for line in lines(on_write):
+            sent.append(line)
+            yield line
+        finished = True
+    finally:
+        if not written:
+            IdempotencyService.abandon(user, key)
+        else:
+            if not finished:
+                # O último lote pode ter sido gravado sem que o evento dele fosse enviado
+                sent.append(json.dumps({
+                    "event": "interrupted",
+                    "detail": "Importação interrompida; o último lote pode ter sido gravado em parte",
+                }, ensure_ascii=False) + "\n")
+            IdempotencyService.complete_soon(
+                user, key, request_hash, (status.HTTP_200_OK, "".join(sent).encode("utf-8"), NDJSON_MEDIA_TYPE)
+            )
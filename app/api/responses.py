@@ -0,0 +1,156 @@
+import gzip
+import json
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
+from fastapi import Request, Response, status
+from pydantic import TypeAdapter
+from starlette.concurrency import run_in_threadpool
+from core.config import settings
+
+# Dependências opcionais: se não estiverem instaladas, o formato/compressão
+# correspondente simplesmente não é oferecido na negociação.
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover
+    msgpack = None
+
+
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+
+# Documentação extra para as rotas que usam a negociação (aparece no Swagger UI)
+NEGOTIATED_RESPONSES = {
+    200: {
+        "content": {
+            "application/json": {},
+            MSGPACK_MEDIA_TYPE: {},
+        },
+        "description": "JSON por padrão; MessagePack com 'Accept: application/msgpack'. "
+                       "Compressão gzip/br conforme 'Accept-Encoding'.",
+    }
+}
+
+
+@lru_cache(maxsize=None)
+def _adapter(model: Any) -> TypeAdapter:
+    # Criar um TypeAdapter é caro, então guardamos um por tipo de resposta.
+    return TypeAdapter(model)
+
+
+def _quality_values(header: str) -> dict:
+    """
+    Interpreta um cabeçalho Accept ou Accept-Encoding e retorna {valor: q}.
+    Valores com q=0 são considerados recusados.
+    """
+    encodings = {}
+    for item in header.split(","):
+        parts = item.strip().split(";")
+        name = parts[0].strip().lower()
+        if not name:
+            continue
+        q = 1.0
+        for param in parts[1:]:
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        encodings[name] = q
+    return encodings
+
+
+def _choose_encoding(header: str) -> Optional[str]:
+    encodings = _quality_values(header)
+    candidates = []
+    if brotli is not None:
+        candidates.append("br")
+    candidates.append("gzip")
+    best, best_q = None, 0.0
+    for name in candidates:
+        q = encodings.get(name, encodings.get("*", 0.0))
+        # Em caso de empate, vence a primeira (br comprime melhor que gzip)
+        if q > best_q:
+            best, best_q = name, q
+    return best
+
+
+def _wants_msgpack(header: str) -> bool:
+    # MessagePack só quando pedido explicitamente, com q > 0 e não menor que o do JSON
+    if msgpack is None:
+        return False
+    accepted = _quality_values(header)
+    msgpack_q = accepted.get(MSGPACK_MEDIA_TYPE, 0.0)
+    json_q = accepted.get("application/json", accepted.get("application/*", accepted.get("*/*", 0.0)))
+    return msgpack_q > 0 and msgpack_q >= json_q
+
+
+def encode_response(
+    content: Any,
+    response_model: Any,
+    accept: str = "",
+    accept_encoding: str = "",
+) -> Tuple[bytes, Dict[str, str], str]:
+    """
+    Serializa `content` usando `response_model` no formato e na compressão negociados
+    a partir dos cabeçalhos Accept e Accept-Encoding.
+
+    Retorna o corpo, os cabeçalhos extras e o media type da resposta.
+
+    Fluxo:
+    1. Valida/serializa o conteúdo com o schema da rota (como o FastAPI faria).
+    2. Gera MessagePack se o cliente pediu 'Accept: application/msgpack', senão JSON compacto.
+    3. Se o corpo passar de settings.COMPRESSION_MIN_SIZE bytes, comprime com br ou gzip
+       de acordo com o 'Accept-Encoding'.
+    """
+    adapter = _adapter(response_model)
+    data = adapter.dump_python(
+        adapter.validate_python(content, from_attributes=True),
+        mode="json",
+    )
+
+    if _wants_msgpack(accept):
+        body = msgpack.packb(data, use_bin_type=True)
+        media_type = MSGPACK_MEDIA_TYPE
+    else:
+        body = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        media_type = "application/json"
+
+    headers = {"Vary": "Accept, Accept-Encoding"}
+
+    # Abaixo do limite a compressão custa mais CPU do que economiza em bytes
+    if len(body) >= settings.COMPRESSION_MIN_SIZE:
+        encoding = _choose_encoding(accept_encoding)
+        if encoding == "br":
+            body = brotli.compress(body, quality=settings.BROTLI_QUALITY)
+            headers["Content-Encoding"] = "br"
+        elif encoding == "gzip":
+            body = gzip.compress(body, compresslevel=settings.GZIP_COMPRESS_LEVEL)
+            headers["Content-Encoding"] = "gzip"
+
+    return body, headers, media_type
+
+
+async def negotiated_response(
+    request: Request,
+    content: Any,
+    response_model: Any,
+    status_code: int = status.HTTP_200_OK,
+) -> Response:
+    """
+    Devolve `content` no formato e na compressão negociados com o cliente (ver `encode_response`).
+
+    Listas com settings.RESPONSE_THREADPOOL_MIN_ITEMS itens ou mais são validadas,
+    serializadas e comprimidas em uma thread, para não bloquear o event loop.
+    """
+    args = (content, response_model, request.headers.get("accept", ""), request.headers.get("accept-encoding", ""))
+    if isinstance(content, (list, tuple)) and len(content) >= settings.RESPONSE_THREADPOOL_MIN_ITEMS:
+        body, headers, media_type = await run_in_threadpool(encode_response, *args)
+    else:
+        body, headers, media_type = encode_response(*args)
+    return Response(content=body, status_code=status_code, headers=headers, media_type=media_type)
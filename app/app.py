@@ -1,4 +1,5 @@
-from fastapi import FastAPI
+import asyncio
+from fastapi import FastAPI, Response
 from beanie import init_beanie
 from motor.motor_asyncio import AsyncIOMotorClient
 from core.config import settings
@@ -6,7 +7,14 @@ from core.config import settings
 from models.user_model import User  # Importe seus modelos aqui
 from api.api_v1.router import router
 from models.todo_model import Todo
+from models.idempotency_model import IdempotencyRecord
+from services.user_service import UserService
 from fastapi.middleware.cors import CORSMiddleware # Importe o middleware CORS, serve para permitir requisições de outras origens
+from core.profiling import ProfilingMiddleware, ProfilingCommandListener
+from core.query_log import slow_query_listener
+from core.admission import AdmissionControlMiddleware
+from core.metrics import registry, CONTENT_TYPE
+from core.loop_monitor import loop_monitor
 
 
 
@@ -15,6 +23,11 @@ app = FastAPI(
     openapi_url=f"{settings.API_V1_STR}/openapi.json"
 )
 
+# Controle de admissão por grupo de rotas (503 + Retry-After quando a fila enche).
+# Adicionado antes do CORS para que as respostas 503 também levem os cabeçalhos de CORS
+if settings.ADMISSION_CONTROL_ENABLED:
+    app.add_middleware(AdmissionControlMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.BACKEND_CORS_ORIGINS, # Permitir requisições dessas origens
@@ -22,14 +35,29 @@ app.add_middleware(
     allow_methods=["*"], # Permitir todos os métodos (GET, POST, etc.
     allow_headers=["*"]) # Permitir todos os cabeçalhos)
 
-@app.on_event("startup")
-async def app_init():
+# O profiling só é instalado quando habilitado, para não custar nada em produção
+if settings.PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+
+async def init_mongo():
     """
-    Inicializa a aplicação FastAPI, conectando ao MongoDB e configurando o Beanie.
+    Conecta ao MongoDB e configura o Beanie (backend de repositórios "beanie").
     """
+    # Listeners do PyMongo, chamados a cada comando enviado ao banco
+    event_listeners = []
+    if settings.PROFILING_ENABLED:
+        event_listeners.append(ProfilingCommandListener())
+    if settings.SLOW_QUERY_LOG_ENABLED:
+        event_listeners.append(slow_query_listener)
+
     # Cria uma instância do cliente MongoDB
-    client = AsyncIOMotorClient(
-        settings.MONGO_CONNECTION_STRING).todoapp
+    mongo_client = AsyncIOMotorClient(
+        settings.MONGO_CONNECTION_STRING,
+        event_listeners=event_listeners)
+    client = mongo_client.todoapp
+
+    # O explain das consultas lentas roda no mesmo event loop da aplicação
+    slow_query_listener.bind(asyncio.get_running_loop(), mongo_client)
     
     # Inicializa o Beanie com a conexão do MongoDB e os modelos definidos
     await init_beanie(database = client, 
@@ -37,13 +65,47 @@ async def app_init():
                             # Adicione seus modelos de documento aqui
                             # Exemplo: User, Item, etc.
                             User,
-                            Todo
+                            Todo,
+                            IdempotencyRecord
                       ]
                       
                       
         )
+
+
+@app.on_event("startup")
+async def app_init():
+    """
+    Inicializa a aplicação FastAPI. Com o backend "beanie", conecta ao MongoDB;
+    com o backend "memory", os repositórios já estão prontos e o MongoDB não é usado.
+    """
+    if settings.REPOSITORY_BACKEND == "beanie":
+        await init_mongo()
+
+    # Carrega os filtros de Bloom usados na verificação de username/email disponíveis
+    await UserService.load_availability_filters()
+
+    # Mede o atraso do event loop e registra quem o bloqueia
+    if settings.EVENT_LOOP_MONITOR_ENABLED:
+        loop_monitor.start()
+
+
+@app.on_event("shutdown")
+async def app_shutdown():
+    """
+    Para as tarefas em segundo plano iniciadas no startup.
+    """
+    await loop_monitor.stop()
     
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """
+    Métricas do processo no formato texto do Prometheus.
+    """
+    return Response(content=registry.expose(), media_type=CONTENT_TYPE)
+
+
 # Abaixo, incluímos o roteador da API versão 1
 app.include_router(
     router,
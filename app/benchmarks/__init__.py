@@ -0,0 +1 @@
+# Torna a pasta 'benchmarks' um pacote Python
@@ -0,0 +1,102 @@
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, List, Optional
+
+from beanie import init_beanie
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from models.todo_model import Todo, list_query_index
+from models.user_model import User
+from repositories.beanie_repository import BeanieTodoRepository
+from schemas.todo_schema import TodoListQuery
+
+
+# Benchmark: latência das operações de tarefas com cada perfil de consistência
+# (core.db_profiles), contra um MongoDB de verdade.
+#
+# - Listagem (list_by_owner, a consulta de TodoService.list_todos) com o perfil de leitura
+#   "relaxed" (secondaryPreferred) e "primary".
+# - Alternar status (update de TodoService.update) com o perfil de escrita "fast" (w=1)
+#   e sem perfil (write concern padrão do cliente; w="majority" a partir do MongoDB 5.0).
+#
+# Feito para um replica set de um nó (como no CI, .github/workflows/tests.yml): ele
+# mostra o custo de esperar a maioria (journal) nas escritas, mas não a latência de
+# replicação nem o ganho de ler de um secundário, que só aparecem com vários nós.
+#
+# Uso (a partir de app/):
+#     MONGO_BENCH_URL=mongodb://localhost:27017/?replicaSet=rs0 python -m benchmarks.db_profiles
+
+MONGO_BENCH_URL = os.environ.get("MONGO_BENCH_URL", "mongodb://localhost:27017/?replicaSet=rs0")
+DATABASE = "todoapp_benchmark_db_profiles"
+
+
+async def _seed(todos: int) -> User:
+    await Todo.get_motor_collection().delete_many({})
+    await User.get_motor_collection().delete_many({})
+    user = await User(username="benchmark", email="benchmark@example.com", hash_password="x").insert()
+    start = datetime(2025, 1, 1)
+    await Todo.insert_many([
+        Todo(title=f"tarefa {i}", status=i % 3 == 0, created_at=start + timedelta(minutes=i),
+             update_at=start + timedelta(minutes=i), owner_id=user.user_id)
+        for i in range(todos)
+    ])
+    return user
+
+
+async def timed(operation: Callable[[], Awaitable], number: int) -> List[float]:
+    """
+    Latência (ms) de `number` execuções de `operation`.
+    """
+    await operation()  # aquece a conexão e o plano da consulta
+    samples = []
+    for _ in range(number):
+        start = time.perf_counter()
+        await operation()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def report(name: str, profile: Optional[str], samples: List[float]) -> None:
+    """
+    Imprime média, p50 e p95 das amostras (ms).
+    """
+    p95 = statistics.quantiles(samples, n=20)[-1] if len(samples) > 1 else samples[0]
+    print(f"{name:<14}{profile or '(padrão)':<12}{statistics.mean(samples):>10.2f}"
+          f"{statistics.median(samples):>10.2f}{p95:>10.2f}")
+
+
+async def run(todos: int, number: int) -> None:
+    client = AsyncIOMotorClient(MONGO_BENCH_URL)
+    await init_beanie(database=client[DATABASE], document_models=[User, Todo])
+    try:
+        user = await _seed(todos)
+        repository = BeanieTodoRepository()
+        query = TodoListQuery(sort="-created_at")
+        index = list_query_index(query.status, query.created_range, query.sort_field)
+        todo = await Todo.find_one(Todo.owner_id == user.user_id)
+
+        print(f"{'operação':<14}{'perfil':<12}{'média ms':>10}{'p50 ms':>10}{'p95 ms':>10}")
+        for read in ("relaxed", "primary"):
+            samples = await timed(lambda: repository.list_by_owner(user, query, read=read, index=index), number)
+            report("listar", read, samples)
+        for write in ("fast", None):
+            samples = await timed(
+                lambda: repository.update(todo, {"status": not todo.status}, write=write), number
+            )
+            report("alternar", write, samples)
+    finally:
+        await client.drop_database(DATABASE)
+        client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compara a latência dos perfis de leitura/escrita (core.db_profiles) em um MongoDB real")
+    parser.add_argument("--todos", type=int, default=200, help="Tarefas do usuário (tamanho da listagem)")
+    parser.add_argument("--number", type=int, default=500, help="Operações por medição")
+    args = parser.parse_args()
+    asyncio.run(run(args.todos, args.number))
@@ -0,0 +1,83 @@
+import argparse
+import os
+import tempfile
+import timeit
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+
+from core import security
+from core.config import settings
+
+
+# Micro-benchmark: assinatura e verificação de access tokens com HS256 e ES256.
+#
+# Usa as mesmas funções da API (create_access_token / decode_access_token), com as
+# chaves já interpretadas em cache, então mede só o custo por token.
+#
+# Uso (a partir de app/):
+#     python -m benchmarks.jwt_signing --number 5000
+
+
+def _clear_key_caches() -> None:
+    # As chaves ficam em lru_cache; ao trocar de algoritmo precisam ser recarregadas
+    for cached in (security._signing_keys, security._verification_keys, security._active_kid, security._secret_key):
+        cached.cache_clear()
+
+
+def _write_ec_key(directory: str) -> None:
+    # Chave P-256 temporária, só para o benchmark
+    private_key = ec.generate_private_key(ec.SECP256R1())
+    pem = private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    with open(os.path.join(directory, "benchmark.pem"), "wb") as f:
+        f.write(pem)
+
+
+def measure(algorithm: str, number: int) -> dict:
+    """
+    Tokens por segundo assinados e verificados com `algorithm`.
+    """
+    settings.ALGORITHM = algorithm
+    _clear_key_caches()
+    token = security.create_access_token("benchmark")  # aquece os caches das chaves
+    security.decode_access_token(token)
+
+    sign = timeit.timeit(lambda: security.create_access_token("benchmark"), number=number)
+    verify = timeit.timeit(lambda: security.decode_access_token(token), number=number)
+    return {
+        "algorithm": algorithm,
+        "sign_per_s": number / sign,
+        "verify_per_s": number / verify,
+        "sign_us": sign / number * 1_000_000,
+        "verify_us": verify / number * 1_000_000,
+    }
+
+
+def main(number: int) -> None:
+    original = (settings.ALGORITHM, settings.JWT_KEYS_DIR, settings.JWT_ACTIVE_KID)
+    with tempfile.TemporaryDirectory() as keys_dir:
+        _write_ec_key(keys_dir)
+        settings.JWT_KEYS_DIR, settings.JWT_ACTIVE_KID = keys_dir, "benchmark"
+        try:
+            results = [measure(algorithm, number) for algorithm in ("HS256", "ES256")]
+        finally:
+            settings.ALGORITHM, settings.JWT_KEYS_DIR, settings.JWT_ACTIVE_KID = original
+            _clear_key_caches()
+
+    print(f"{'algoritmo':<10}{'assinar/s':>14}{'verificar/s':>14}{'assinar µs':>14}{'verificar µs':>14}")
+    for r in results:
+        print(
+            f"{r['algorithm']:<10}{r['sign_per_s']:>14.0f}{r['verify_per_s']:>14.0f}"
+            f"{r['sign_us']:>14.1f}{r['verify_us']:>14.1f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compara HS256 e ES256 na assinatura e verificação de access tokens")
+    parser.add_argument("--number", type=int, default=5000, help="Tokens por medição")
+    args = parser.parse_args()
+    main(args.number)
@@ -0,0 +1,88 @@
+import argparse
+import asyncio
+import random
+from datetime import datetime, timedelta
+
+from beanie import init_beanie
+from motor.motor_asyncio import AsyncIOMotorClient
+
+from benchmarks.db_profiles import MONGO_BENCH_URL, report, timed
+from core.config import settings
+from models.todo_model import Todo
+from models.user_model import User
+from schemas.todo_schema import TodoCreate
+from services.todo_service import TodoService
+
+
+# Benchmark: criação e listagem de tarefas antes e depois do owner_id
+# (migrations.todo_owner_id), contra um MongoDB de verdade.
+#
+# - "dbref": como antes da migração. Cria com o Link[User] (owner) e lista com
+#   Todo.owner.id == user.id sem índice no dono (hint $natural, como na versão original).
+# - "compat": TodoService com settings.TODO_OWNER_COMPAT_READS (owner_id ou owner.$id).
+# - "owner_id": TodoService sem o ramo de compatibilidade (depois da migração).
+#
+# Todas as tarefas semeadas têm owner e owner_id (o estado logo depois da migração),
+# então as três listagens devolvem as mesmas tarefas.
+#
+# Uso (a partir de app/):
+#     MONGO_BENCH_URL=mongodb://localhost:27017/?replicaSet=rs0 python -m benchmarks.owner_filter
+
+DATABASE = "todoapp_benchmark_owner_filter"
+
+
+async def _seed(users: int, todos: int) -> User:
+    await Todo.get_motor_collection().delete_many({})
+    await User.get_motor_collection().delete_many({})
+    rng = random.Random(30)
+    start = datetime(2025, 1, 1)
+    owners = [
+        await User(username=f"user{i}", email=f"user{i}@example.com", hash_password="x").insert()
+        for i in range(users)
+    ]
+    for owner in owners:
+        await Todo.insert_many([
+            Todo(title=f"tarefa {rng.randrange(100_000)}", status=rng.random() < 0.3,
+                 created_at=start + timedelta(minutes=rng.randrange(500_000)), update_at=start,
+                 owner=owner, owner_id=owner.user_id)
+            for _ in range(todos)
+        ])
+    return owners[0]
+
+
+async def run(users: int, todos: int, number: int) -> None:
+    client = AsyncIOMotorClient(MONGO_BENCH_URL)
+    await init_beanie(database=client[DATABASE], document_models=[User, Todo])
+    original = settings.TODO_OWNER_COMPAT_READS
+    try:
+        user = await _seed(users, todos)
+        data = TodoCreate(title="nova tarefa", description="criada pelo benchmark")
+
+        print(f"{'operação':<14}{'variante':<12}{'média ms':>10}{'p50 ms':>10}{'p95 ms':>10}")
+        samples = await timed(
+            lambda: Todo.find(Todo.owner.id == user.id, hint=[("$natural", 1)]).to_list(), number
+        )
+        report("listar", "dbref", samples)
+        for compat in (True, False):
+            settings.TODO_OWNER_COMPAT_READS = compat
+            samples = await timed(lambda: TodoService.list_todos(user), number)
+            report("listar", "compat" if compat else "owner_id", samples)
+
+        samples = await timed(lambda: Todo(**data.model_dump(), owner=user).insert(), number)
+        report("criar", "dbref", samples)
+        samples = await timed(lambda: TodoService.create_todo(user, data), number)
+        report("criar", "owner_id", samples)
+    finally:
+        settings.TODO_OWNER_COMPAT_READS = original
+        await client.drop_database(DATABASE)
+        client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compara criar/listar tarefas com o dono em DBRef (owner.$id) e em owner_id")
+    parser.add_argument("--users", type=int, default=50, help="Usuários semeados")
+    parser.add_argument("--todos", type=int, default=200, help="Tarefas por usuário")
+    parser.add_argument("--number", type=int, default=200, help="Operações por medição")
+    args = parser.parse_args()
+    asyncio.run(run(args.users, args.todos, args.number))
@@ -0,0 +1,106 @@
+import argparse
+import asyncio
+import random
+import time
+from datetime import datetime, timedelta
+from typing import List
+from uuid import uuid4
+
+from starlette.requests import Request
+
+from api.responses import MSGPACK_MEDIA_TYPE, negotiated_response
+from core.config import settings
+from schemas.todo_schema import TodoDetail
+
+
+# Micro-benchmark: custo de CPU x bytes economizados na resposta negociada da listagem.
+#
+# Chama negotiated_response (a mesma função de GET /todo/) com N tarefas em JSON e em
+# MessagePack, sem compressão, com gzip e com br, para cada valor de COMPRESSION_MIN_SIZE.
+# A resposta é gerada sempre no event loop (sem a thread), para medir só a codificação.
+#
+# Uso (a partir de app/):
+#     python -m benchmarks.response_encoding --items 10 100 1000 --thresholds 256 1024 4096
+
+
+FORMATS = {"json": "application/json", "msgpack": MSGPACK_MEDIA_TYPE}
+ENCODINGS = ("identity", "gzip", "br")
+
+
+def _todos(count: int) -> List[dict]:
+    # Tarefas parecidas com as reais: títulos curtos, metade com descrição
+    rng = random.Random(26)
+    start = datetime(2025, 1, 1)
+    return [
+        {
+            "todo_id": uuid4(),
+            "title": f"Tarefa {rng.randrange(100_000)}",
+            "description": " ".join(rng.choice(("comprar", "revisar", "enviar", "relatório", "reunião", "código"))
+                                    for _ in range(rng.randrange(3, 20))) if i % 2 else None,
+            "status": rng.random() < 0.3,
+            "created_at": start + timedelta(minutes=rng.randrange(500_000)),
+            "update_at": start + timedelta(minutes=rng.randrange(500_000)),
+            "owner_id": uuid4(),
+        }
+        for i in range(count)
+    ]
+
+
+def _request(accept: str, accept_encoding: str) -> Request:
+    headers = [(b"accept", accept.encode()), (b"accept-encoding", accept_encoding.encode())]
+    return Request({"type": "http", "method": "GET", "path": "/api/v1/todo/", "headers": headers})
+
+
+async def measure(todos: List[dict], fmt: str, encoding: str, number: int) -> dict:
+    """
+    Tempo médio por resposta (µs), tamanho no fio e a compressão aplicada.
+    """
+    request = _request(FORMATS[fmt], encoding)
+    response = await negotiated_response(request, todos, List[TodoDetail])  # aquece o TypeAdapter
+    start = time.perf_counter()
+    for _ in range(number):
+        await negotiated_response(request, todos, List[TodoDetail])
+    elapsed = time.perf_counter() - start
+    return {
+        "us": elapsed / number * 1_000_000,
+        "bytes": len(response.body),
+        "applied": response.headers.get("content-encoding", "identity"),
+    }
+
+
+async def run(items: List[int], thresholds: List[int], number: int) -> None:
+    print(f"{'itens':>6}{'limite':>8}{'formato':>9}{'pedido':>10}{'aplicado':>10}"
+          f"{'bytes':>10}{'µs':>10}{'economia':>10}{'µs extra':>10}")
+    for count in items:
+        todos = _todos(count)
+        # Menos repetições para listas grandes, para o benchmark não demorar demais
+        repeat = max(1, number // count)
+        for threshold in thresholds:
+            settings.COMPRESSION_MIN_SIZE = threshold
+            for fmt in FORMATS:
+                base = await measure(todos, fmt, "identity", repeat)
+                for encoding in ENCODINGS:
+                    r = base if encoding == "identity" else await measure(todos, fmt, encoding, repeat)
+                    saved = 1 - r["bytes"] / base["bytes"]
+                    print(f"{count:>6}{threshold:>8}{fmt:>9}{encoding:>10}{r['applied']:>10}"
+                          f"{r['bytes']:>10}{r['us']:>10.1f}{saved:>10.0%}{r['us'] - base['us']:>10.1f}")
+
+
+def main(items: List[int], thresholds: List[int], number: int) -> None:
+    original = (settings.COMPRESSION_MIN_SIZE, settings.RESPONSE_THREADPOOL_MIN_ITEMS)
+    settings.RESPONSE_THREADPOOL_MIN_ITEMS = max(items) + 1
+    try:
+        asyncio.run(run(items, thresholds, number))
+    finally:
+        settings.COMPRESSION_MIN_SIZE, settings.RESPONSE_THREADPOOL_MIN_ITEMS = original
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compara tempo de codificação e tamanho da resposta (JSON/MessagePack, gzip/br)")
+    parser.add_argument("--items", type=int, nargs="+", default=[10, 100, 1000], help="Tarefas por resposta")
+    parser.add_argument("--thresholds", type=int, nargs="+", default=[256, 1024, 4096],
+                        help="Valores de COMPRESSION_MIN_SIZE (bytes)")
+    parser.add_argument("--number", type=int, default=20000, help="Tarefas codificadas por medição")
+    args = parser.parse_args()
+    main(args.items, args.thresholds, args.number)
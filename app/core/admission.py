@@ -0,0 +1,162 @@
+import asyncio
+import json
+from collections import deque
+from time import perf_counter
+from typing import Deque, Dict, Optional
+
+from core.config import settings
+from core.metrics import Counter, Gauge, Histogram
+
+
+# Controle de admissão (load shedding).
+#
+# Sem limite, sob sobrecarga todas as requisições são aceitas e a latência de todas cresce
+# sem parar (o bcrypt de login/cadastro disputa a CPU com as leituras baratas de tarefas).
+# Aqui cada grupo de rotas tem um número máximo de requisições em execução e uma fila
+# limitada; quando a fila está cheia a requisição recebe 503 com Retry-After na hora,
+# sem consumir nada da aplicação.
+
+ADMISSION_IN_FLIGHT = Gauge(
+    "admission_in_flight", "Requisições em execução por grupo de rotas", ["group"])
+ADMISSION_QUEUE_LENGTH = Gauge(
+    "admission_queue_length", "Requisições esperando na fila por grupo de rotas", ["group"])
+ADMISSION_SHED = Counter(
+    "admission_shed_total", "Requisições rejeitadas com 503 (queue_full ou timeout)", ["group", "reason"])
+ADMISSION_QUEUE_WAIT = Histogram(
+    "admission_queue_wait_seconds", "Tempo de espera na fila das requisições admitidas",
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0), labels=["group"])
+
+
+class AdmissionGroup:
+    """
+    Limite de concorrência com fila limitada, em ordem de chegada.
+
+    Diferente de um asyncio.Semaphore, a fila tem tamanho máximo: `acquire` devolve
+    False na hora quando ela está cheia, ou depois de `timeout` segundos esperando.
+    """
+
+    def __init__(self, name: str, concurrency: int, queue: int, timeout: float) -> None:
+        self.name = name
+        self.concurrency = concurrency
+        self.queue = queue
+        self.timeout = timeout
+        self.in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._update_gauges()
+
+    def _update_gauges(self) -> None:
+        ADMISSION_IN_FLIGHT.set(self.name, value=self.in_flight)
+        ADMISSION_QUEUE_LENGTH.set(self.name, value=len(self._waiters))
+
+    async def acquire(self) -> bool:
+        if self.in_flight < self.concurrency and not self._waiters:
+            self.in_flight += 1
+            self._update_gauges()
+            return True
+
+        if len(self._waiters) >= self.queue:
+            ADMISSION_SHED.inc(self.name, "queue_full")
+            return False
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._update_gauges()
+        start = perf_counter()
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.timeout)
+        except asyncio.TimeoutError:
+            if waiter.done():
+                # A vaga chegou junto com o timeout: fica com ela
+                ADMISSION_QUEUE_WAIT.observe(self.name, value=perf_counter() - start)
+                return True
+            waiter.cancel()
+            self._waiters.remove(waiter)
+            self._update_gauges()
+            ADMISSION_SHED.inc(self.name, "timeout")
+            return False
+        except asyncio.CancelledError:
+            # Cliente desconectou enquanto esperava
+            if waiter.done():
+                self.release()
+            else:
+                waiter.cancel()
+                self._waiters.remove(waiter)
+                self._update_gauges()
+            raise
+
+        ADMISSION_QUEUE_WAIT.observe(self.name, value=perf_counter() - start)
+        return True
+
+    def release(self) -> None:
+        # A vaga passa direto para o primeiro da fila; in_flight só diminui se ninguém espera
+        if self._waiters:
+            self._waiters.popleft().set_result(None)
+        else:
+            self.in_flight -= 1
+        self._update_gauges()
+
+
+def route_group(method: str, path: str) -> Optional[str]:
+    """
+    Grupo de admissão da rota, ou None para rotas sem limite (docs, métricas, /users/me,
+    /auth/jwks.json, /auth/refresh...).
+
+    "auth" é só para as rotas que calculam bcrypt (login e cadastro): o JWKS é lido por
+    outros serviços e não pode ser rejeitado durante um pico de logins.
+    """
+    prefix = settings.API_V1_STR
+    if method == "POST" and path in (f"{prefix}/auth/login", f"{prefix}/users/create"):
+        return "auth"
+    if path == f"{prefix}/todo" or path.startswith(f"{prefix}/todo/"):
+        if method in ("GET", "HEAD") or path == f"{prefix}/todo/batch-get":
+            return "todo_reads"
+        return "todo_writes"
+    return None
+
+
+class AdmissionControlMiddleware:
+    """
+    Middleware ASGI que aplica os limites de settings.ADMISSION_LIMITS por grupo de rotas.
+
+    É um middleware ASGI puro (não BaseHTTPMiddleware) para que a vaga só seja liberada
+    quando a resposta termina de ser enviada, inclusive em respostas em stream.
+    """
+
+    def __init__(self, app) -> None:
+        self.app = app
+        self.groups: Dict[str, AdmissionGroup] = {
+            name: AdmissionGroup(name, limits["concurrency"], limits["queue"], settings.ADMISSION_QUEUE_TIMEOUT)
+            for name, limits in settings.ADMISSION_LIMITS.items()
+        }
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        group = self.groups.get(route_group(scope["method"], scope["path"]))
+        if group is None:
+            await self.app(scope, receive, send)
+            return
+
+        if not await group.acquire():
+            await self._reject(send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            group.release()
+
+    @staticmethod
+    async def _reject(send) -> None:
+        body = json.dumps({"detail": "Servidor sobrecarregado, tente novamente em instantes"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+                (b"retry-after", str(settings.ADMISSION_RETRY_AFTER).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,39 @@
+import hashlib
+import math
+
+
+class BloomFilter:
+    """
+    Filtro de Bloom em memória: responde "com certeza não existe" ou "talvez exista".
+
+    - Se `valor in filtro` é False, o valor nunca foi adicionado (sem falso negativo).
+    - Se é True, o valor provavelmente foi adicionado; a chance de erro fica perto de
+      `error_rate` enquanto o número de itens não passar de `capacity`.
+
+    Em Java, seria algo como o BloomFilter do Guava.
+    """
+
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        capacity = max(capacity, 1)
+        # Tamanho ótimo em bits: m = -n * ln(p) / ln(2)^2
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        # Quantidade ótima de funções de hash: k = m / n * ln(2)
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, value: str):
+        # Double hashing: dois hashes de 64 bits geram as k posições
+        digest = hashlib.blake2b(value.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, value: str) -> None:
+        for position in self._positions(value):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, value: str) -> bool:
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
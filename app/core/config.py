@@ -1,4 +1,4 @@
-from typing import List
+from typing import Any, Dict, List
 from decouple import config
 from pydantic import AnyHttpUrl
 from pydantic_settings import BaseSettings
@@ -18,7 +18,14 @@ class Settings(BaseSettings):
     PROJECT_NAME: str = config("PROJECT_NAME", default="TODO-AUTH")
     
     # Algoritmo usado para assinar os tokens JWT, padrão HS256
+    # Com ES256/ES384/ES512/RS256, o access token é assinado com as chaves de JWT_KEYS_DIR
     ALGORITHM: str = config("ALGORITHM", default="HS256")
+
+    # Diretório com as chaves privadas PEM (um arquivo <kid>.pem por chave), usado com algoritmos assimétricos
+    JWT_KEYS_DIR: str = config("JWT_KEYS_DIR", default="keys")
+
+    # kid da chave usada para assinar novos tokens; as demais continuam só validando (rotação)
+    JWT_ACTIVE_KID: str = config("JWT_ACTIVE_KID", default="")
     
     # Tempo de expiração do token de acesso (em minutos)
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
@@ -34,9 +41,132 @@ class Settings(BaseSettings):
         "http://localhost",
     ]
     
+    # Backend dos repositórios: "beanie" (MongoDB) ou "memory" (dicionários em memória,
+    # para rodar testes de carga e profiling sem MongoDB)
+    REPOSITORY_BACKEND: str = config("REPOSITORY_BACKEND", default="beanie")
+
     # String de conexão com o banco de dados MongoDB
     MONGO_CONNECTION_STRING: str = config("MONGO_CONNECTION_STRING", cast=str)
 
+    # Tamanho mínimo (em bytes) do corpo da resposta para aplicar compressão gzip/br
+    COMPRESSION_MIN_SIZE: int = config("COMPRESSION_MIN_SIZE", default=1024, cast=int)
+
+    # Nível de compressão gzip (1 = mais rápido, 9 = menor tamanho)
+    GZIP_COMPRESS_LEVEL: int = config("GZIP_COMPRESS_LEVEL", default=6, cast=int)
+
+    # Qualidade da compressão brotli (0 a 11); valores médios equilibram CPU e tamanho
+    BROTLI_QUALITY: int = config("BROTLI_QUALITY", default=5, cast=int)
+
+    # A partir de quantos itens a resposta negociada (validação, serialização e compressão)
+    # é gerada em uma thread, fora do event loop
+    RESPONSE_THREADPOOL_MIN_ITEMS: int = config("RESPONSE_THREADPOOL_MIN_ITEMS", default=200, cast=int)
+
+    # Quantidade máxima de IDs aceitos por POST /todo/batch-get
+    TODO_BATCH_MAX_IDS: int = config("TODO_BATCH_MAX_IDS", default=100, cast=int)
+
+    # Quantidade de linhas validadas e inseridas por lote no POST /todo/import
+    TODO_IMPORT_BATCH_SIZE: int = config("TODO_IMPORT_BATCH_SIZE", default=1000, cast=int)
+
+    # Quantidade máxima de erros por linha detalhados na resposta do import (os demais só são contados)
+    TODO_IMPORT_MAX_ERRORS: int = config("TODO_IMPORT_MAX_ERRORS", default=100, cast=int)
+
+    # Tempo (em segundos) que as respostas das escritas com Idempotency-Key ficam guardadas (índice TTL)
+    IDEMPOTENCY_TTL_SECONDS: int = config("IDEMPOTENCY_TTL_SECONDS", default=60 * 60 * 24, cast=int)
+
+    # Quantidade de respostas idempotentes mantidas no cache em memória, na frente do MongoDB
+    IDEMPOTENCY_CACHE_SIZE: int = config("IDEMPOTENCY_CACHE_SIZE", default=10_000, cast=int)
+
+    # Tempo máximo (em segundos) que uma requisição repetida espera a original terminar antes de receber 409
+    IDEMPOTENCY_WAIT_TIMEOUT: float = config("IDEMPOTENCY_WAIT_TIMEOUT", default=30.0, cast=float)
+
+    # Enquanto a migração do owner_id roda, as consultas também aceitam o DBRef antigo (owner.$id).
+    # Desligue depois que `python -m migrations.todo_owner_id` terminar
+    TODO_OWNER_COMPAT_READS: bool = config("TODO_OWNER_COMPAT_READS", default=True, cast=bool)
+
+    # Perfis de write concern por operação (argumentos de pymongo.WriteConcern).
+    # Os services escolhem o perfil explicitamente: "fast" para alternar status de tarefas,
+    # "durable" para a criação de usuários
+    DB_WRITE_PROFILES: Dict[str, Dict[str, Any]] = {
+        "fast": {"w": 1},
+        "durable": {"w": "majority"},
+    }
+
+    # Perfis de read preference por operação. "relaxed" lê de secundários com atraso
+    # máximo limitado (max_staleness em segundos, mínimo 90) e é usado nas listagens
+    DB_READ_PROFILES: Dict[str, Dict[str, Any]] = {
+        "primary": {"mode": "primary"},
+        "relaxed": {"mode": "secondaryPreferred", "max_staleness": 90},
+    }
+
+    # Quantidade de usuários prevista para dimensionar os filtros de Bloom de username/email
+    BLOOM_EXPECTED_USERS: int = config("BLOOM_EXPECTED_USERS", default=100_000, cast=int)
+
+    # Taxa de falso positivo desejada dos filtros de Bloom (um falso positivo custa uma consulta)
+    BLOOM_ERROR_RATE: float = config("BLOOM_ERROR_RATE", default=0.01, cast=float)
+
+    # Os filtros de Bloom são de cada processo: antes de responder "livre", um filtro
+    # sincronizado há mais de BLOOM_SYNC_INTERVAL segundos lê os usuários criados desde a
+    # última sincronização (inclusive por outros workers). 0 = sincroniza em toda resposta "livre"
+    BLOOM_SYNC_INTERVAL: float = config("BLOOM_SYNC_INTERVAL", default=1.0, cast=float)
+
+    # Margem (segundos) relida a cada sincronização, para cobrir diferença de relógio entre
+    # servidores e inserts que terminam depois de a sincronização começar
+    BLOOM_SYNC_OVERLAP: float = config("BLOOM_SYNC_OVERLAP", default=60.0, cast=float)
+
+    # Liga o controle de admissão: cada grupo de rotas tem um limite de requisições simultâneas
+    # e uma fila limitada; acima disso a requisição recebe 503 na hora
+    ADMISSION_CONTROL_ENABLED: bool = config("ADMISSION_CONTROL_ENABLED", default=True, cast=bool)
+
+    # Limites por grupo de rotas: "concurrency" = requisições em execução, "queue" = requisições esperando.
+    # "auth" (login e cadastro, caros por causa do bcrypt) fica separado das leituras e escritas de tarefas
+    ADMISSION_LIMITS: Dict[str, Dict[str, int]] = {
+        "auth": {"concurrency": 4, "queue": 16},
+        "todo_reads": {"concurrency": 64, "queue": 128},
+        "todo_writes": {"concurrency": 16, "queue": 64},
+    }
+
+    # Tempo máximo (em segundos) que uma requisição espera na fila antes de receber 503
+    ADMISSION_QUEUE_TIMEOUT: float = config("ADMISSION_QUEUE_TIMEOUT", default=2.0, cast=float)
+
+    # Valor do cabeçalho Retry-After (em segundos) das respostas 503
+    ADMISSION_RETRY_AFTER: int = config("ADMISSION_RETRY_AFTER", default=1, cast=int)
+
+    # Liga o monitor de atraso (lag) do event loop, exportado em GET /metrics
+    EVENT_LOOP_MONITOR_ENABLED: bool = config("EVENT_LOOP_MONITOR_ENABLED", default=True, cast=bool)
+
+    # Intervalo (em segundos) entre as medições de atraso do event loop
+    EVENT_LOOP_MONITOR_INTERVAL: float = config("EVENT_LOOP_MONITOR_INTERVAL", default=0.1, cast=float)
+
+    # Atraso (em milissegundos) a partir do qual a pilha da corrotina que bloqueia o loop é registrada no log
+    EVENT_LOOP_LAG_THRESHOLD_MS: float = config("EVENT_LOOP_LAG_THRESHOLD_MS", default=100, cast=float)
+
+    # Liga o hook de profiling por requisição. Desligado, nada é instalado (custo zero)
+    PROFILING_ENABLED: bool = config("PROFILING_ENABLED", default=False, cast=bool)
+
+    # Token que os administradores enviam no cabeçalho X-Profile-Token para receber o profile
+    PROFILING_TOKEN: str = config("PROFILING_TOKEN", default="")
+
+    # Fração das requisições medidas por amostragem (0.0 a 1.0), gravadas em PROFILING_DIR
+    PROFILING_SAMPLE_RATE: float = config("PROFILING_SAMPLE_RATE", default=0.0, cast=float)
+
+    # Diretório onde os profiles amostrados são gravados
+    PROFILING_DIR: str = config("PROFILING_DIR", default="profiles")
+
+    # Quantidade de funções (por tempo acumulado) incluídas no relatório
+    PROFILING_TOP_FUNCTIONS: int = config("PROFILING_TOP_FUNCTIONS", default=40, cast=int)
+
+    # Liga o log de consultas lentas do MongoDB
+    SLOW_QUERY_LOG_ENABLED: bool = config("SLOW_QUERY_LOG_ENABLED", default=True, cast=bool)
+
+    # Duração (em milissegundos) a partir da qual um comando é considerado lento
+    SLOW_QUERY_THRESHOLD_MS: float = config("SLOW_QUERY_THRESHOLD_MS", default=100, cast=float)
+
+    # Roda explain("executionStats") uma vez por formato de consulta lenta
+    SLOW_QUERY_EXPLAIN: bool = config("SLOW_QUERY_EXPLAIN", default=True, cast=bool)
+
+    # Quantidade máxima de formatos de consulta com explain guardado em cache
+    SLOW_QUERY_EXPLAIN_CACHE_SIZE: int = config("SLOW_QUERY_EXPLAIN_CACHE_SIZE", default=1000, cast=int)
+
     class Config:
         # Define se os nomes dos campos são sensíveis a maiúsculas/minúsculas
         case_sensitive = True
@@ -0,0 +1,101 @@
+from functools import lru_cache
+from typing import List, Optional, Tuple, Type, TypeVar
+
+from beanie import Document
+from beanie.odm.utils.dump import get_dict
+from beanie.odm.utils.parsing import parse_obj
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo import WriteConcern
+from pymongo.read_preferences import (
+    Nearest,
+    Primary,
+    PrimaryPreferred,
+    Secondary,
+    SecondaryPreferred,
+    _ServerMode,
+)
+from core.config import settings
+
+
+# Perfis de consistência por operação.
+#
+# O Beanie sempre usa o write concern e a read preference padrão do cliente.
+# Aqui montamos (uma vez só, com cache) os objetos do PyMongo a partir dos perfis
+# nomeados em settings.DB_WRITE_PROFILES / settings.DB_READ_PROFILES, e os services
+# escolhem explicitamente qual perfil cada operação usa.
+
+DocumentType = TypeVar("DocumentType", bound=Document)
+
+_READ_MODES = {
+    "primary": Primary,
+    "primaryPreferred": PrimaryPreferred,
+    "secondary": Secondary,
+    "secondaryPreferred": SecondaryPreferred,
+    "nearest": Nearest,
+}
+
+
+@lru_cache(maxsize=None)
+def write_concern(profile: str) -> WriteConcern:
+    """
+    Retorna o WriteConcern do perfil (ex.: "fast" -> w=1, "durable" -> w="majority").
+    """
+    return WriteConcern(**settings.DB_WRITE_PROFILES[profile])
+
+
+@lru_cache(maxsize=None)
+def read_preference(profile: str) -> _ServerMode:
+    """
+    Retorna a read preference do perfil (ex.: "relaxed" -> secondaryPreferred
+    com max_staleness). O MongoDB exige max_staleness de pelo menos 90 segundos.
+    """
+    options = dict(settings.DB_READ_PROFILES[profile])
+    mode = _READ_MODES[options.pop("mode", "primary")]
+    return mode(**options)
+
+
+def collection(
+    document: Type[Document],
+    read: Optional[str] = None,
+    write: Optional[str] = None,
+) -> AsyncIOMotorCollection:
+    """
+    Coleção do Motor do documento com os perfis de leitura/escrita aplicados.
+    Sem perfil, mantém o padrão do cliente.
+    """
+    options = {}
+    if read is not None:
+        options["read_preference"] = read_preference(read)
+    if write is not None:
+        options["write_concern"] = write_concern(write)
+    motor_collection = document.get_motor_collection()
+    return motor_collection.with_options(**options) if options else motor_collection
+
+
+async def find_all(
+    document: Type[DocumentType],
+    query: dict,
+    read: str,
+    sort: Optional[List[Tuple[str, int]]] = None,
+    hint: Optional[str] = None,
+) -> list:
+    """
+    Equivalente a `Document.find(query).sort(sort).to_list()` usando o perfil de leitura `read`.
+    `query` deve ser o filtro já codificado (ex.: `Todo.find(...).get_filter_query()`);
+    `hint` força o índice com esse nome.
+    """
+    cursor = collection(document, read=read).find(query, sort=sort, hint=hint)
+    return [parse_obj(document, data) async for data in cursor]
+
+
+async def insert(document: DocumentType, write: str) -> DocumentType:
+    """
+    Equivalente a `document.insert()` usando o perfil de escrita `write`.
+
+    Observação: os hooks @before_event(Insert) do Beanie não são executados aqui.
+    """
+    result = await collection(type(document), write=write).insert_one(
+        get_dict(document, to_db=True, keep_nulls=document.get_settings().keep_nulls)
+    )
+    document.id = result.inserted_id
+    return document
@@ -0,0 +1,128 @@
+import asyncio
+import logging
+import os
+import sys
+import threading
+import traceback
+from time import perf_counter
+from typing import List, Optional
+
+from core.config import settings
+from core.metrics import Counter, Histogram
+
+
+logger = logging.getLogger(__name__)
+
+# Monitor de atraso (lag) do event loop.
+#
+# Código síncrono dentro de rotas async (bcrypt do passlib, validação do pydantic em listas
+# grandes...) trava o event loop e atrasa todas as outras requisições. Uma tarefa no próprio
+# loop mede o atraso continuamente; uma thread separada (watchdog) percebe quando o loop
+# parou de responder e registra no log a pilha do código que está bloqueando.
+
+EVENT_LOOP_LAG = Histogram(
+    "event_loop_lag_seconds", "Atraso do event loop em relação ao intervalo esperado",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0))
+EVENT_LOOP_BLOCKED = Counter(
+    "event_loop_blocked_total", "Vezes em que o event loop ficou bloqueado acima do limite")
+
+# Arquivo do asyncio onde os callbacks do loop são executados (Handle._run)
+_ASYNCIO_EVENTS = os.path.join("asyncio", "events.py")
+
+
+def _blocking_stack(frame) -> List[str]:
+    # Descarta os frames do próprio loop e mantém só o código da aplicação
+    summary = traceback.extract_stack(frame)
+    start = 0
+    for index, entry in enumerate(summary):
+        if entry.filename.endswith(_ASYNCIO_EVENTS):
+            start = index + 1
+    return traceback.format_list(summary[start:] or summary)
+
+
+class EventLoopMonitor:
+    """
+    Mede o atraso do event loop e registra a pilha de quem o bloqueia.
+
+    - A tarefa de medição dorme `interval` segundos e observa quanto acordou atrasada
+      (histograma event_loop_lag_seconds).
+    - A thread watchdog confere o último "batimento" da tarefa; se o loop ficou parado
+      por mais de `interval` + o limite, captura a pilha da thread do loop com
+      sys._current_frames(), que mostra a linha exata que está bloqueando.
+      Cada bloqueio é registrado uma única vez.
+    """
+
+    def __init__(self, interval: float, threshold: float) -> None:
+        self.interval = interval
+        self.threshold = threshold
+        self._heartbeat = perf_counter()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+
+    def start(self) -> None:
+        """
+        Inicia a medição no event loop atual e a thread watchdog.
+        """
+        if self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = perf_counter()
+        self._stopping.clear()
+        self._task = self._loop.create_task(self._probe(), name="event-loop-monitor")
+        self._watchdog = threading.Thread(target=self._watch, name="event-loop-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        """
+        Para a medição e a thread watchdog.
+        """
+        if self._task is None:
+            return
+        self._stopping.set()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._watchdog = None
+
+    async def _probe(self) -> None:
+        while True:
+            start = perf_counter()
+            await asyncio.sleep(self.interval)
+            now = perf_counter()
+            EVENT_LOOP_LAG.observe(value=max(now - start - self.interval, 0.0))
+            self._heartbeat = now
+
+    def _watch(self) -> None:
+        reported = None
+        while not self._stopping.wait(self.interval / 2):
+            heartbeat = self._heartbeat
+            stalled = perf_counter() - heartbeat - self.interval
+            if stalled < self.threshold or heartbeat == reported:
+                continue
+            # O loop está parado agora: a pilha da thread dele mostra quem está bloqueando
+            reported = heartbeat
+            EVENT_LOOP_BLOCKED.inc()
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            task = asyncio.current_task(self._loop)
+            logger.warning(
+                "Event loop bloqueado há %.0f ms (tarefa %s). Pilha:\n%s",
+                stalled * 1000,
+                task.get_name() if task is not None else "?",
+                "".join(_blocking_stack(frame)),
+            )
+
+
+# Instância única, iniciada e parada nos eventos de startup/shutdown em app.py
+loop_monitor = EventLoopMonitor(
+    settings.EVENT_LOOP_MONITOR_INTERVAL,
+    settings.EVENT_LOOP_LAG_THRESHOLD_MS / 1000,
+)
@@ -0,0 +1,257 @@
+import cProfile
+import inspect
+import json
+import os
+import pstats
+import random
+import re
+import secrets
+from collections import defaultdict
+from contextvars import ContextVar
+from datetime import datetime
+from functools import wraps
+from time import perf_counter
+from typing import Callable, Dict, List, Optional
+
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+from pymongo import monitoring
+from starlette.concurrency import run_in_threadpool
+from starlette.middleware.base import BaseHTTPMiddleware
+from core.config import settings
+
+
+# Cabeçalho que pede o profile de uma requisição. O valor precisa ser igual a
+# settings.PROFILING_TOKEN, que só os administradores conhecem.
+PROFILE_HEADER = "X-Profile-Token"
+
+# Camadas em que o tempo de uma requisição é dividido
+LAYERS = ("handler", "service", "db", "serialization")
+
+
+class RequestProfile:
+    """
+    Acumula o tempo gasto em cada camada durante uma única requisição.
+
+    Os tempos são exclusivos: o tempo de uma camada interna (ex.: db dentro de service)
+    é descontado da camada externa, então a soma das camadas não passa do total.
+    A pilha assume que a requisição executa suas etapas em sequência, como acontece
+    em todas as rotas atuais (sem asyncio.gather dentro de uma mesma requisição).
+    """
+
+    def __init__(self) -> None:
+        self.layers: Dict[str, float] = defaultdict(float)
+        self._stack: List[float] = []
+
+    def enter(self) -> None:
+        self._stack.append(0.0)
+
+    def exit(self, layer: str, elapsed: float) -> None:
+        nested = self._stack.pop()
+        self.layers[layer] += elapsed - nested
+        if self._stack:
+            self._stack[-1] += elapsed
+
+    def add_db(self, elapsed: float) -> None:
+        # Comandos do MongoDB não têm camada interna, entram direto
+        self.layers["db"] += elapsed
+        if self._stack:
+            self._stack[-1] += elapsed
+
+
+# Profile da requisição atual; None quando a requisição não está sendo medida
+_current_profile: ContextVar[Optional[RequestProfile]] = ContextVar("request_profile", default=None)
+
+
+def profiled(layer: str) -> Callable:
+    """
+    Decorator que soma o tempo da função na camada `layer` do profile atual.
+
+    Quando settings.PROFILING_ENABLED é falso a função é devolvida sem alterações,
+    então o hook não custa nada em produção.
+    """
+    def decorator(func: Callable) -> Callable:
+        if not settings.PROFILING_ENABLED:
+            return func
+
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                profile = _current_profile.get()
+                if profile is None:
+                    return await func(*args, **kwargs)
+                profile.enter()
+                start = perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    profile.exit(layer, perf_counter() - start)
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            profile = _current_profile.get()
+            if profile is None:
+                return func(*args, **kwargs)
+            profile.enter()
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profile.exit(layer, perf_counter() - start)
+        return wrapper
+
+    return decorator
+
+
+class ProfilingCommandListener(monitoring.CommandListener):
+    """
+    Listener do PyMongo que soma a duração de cada comando na camada "db".
+
+    O Motor executa o PyMongo em threads copiando o contexto da corrotina,
+    por isso o profile da requisição é visível aqui.
+    """
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        pass
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        profile = _current_profile.get()
+        if profile is not None:
+            profile.add_db(event.duration_micros / 1_000_000)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        profile = _current_profile.get()
+        if profile is not None:
+            profile.add_db(event.duration_micros / 1_000_000)
+
+
+class ProfilingRoute(APIRoute):
+    """
+    Rota que mede separadamente o handler e o restante do trabalho do FastAPI
+    (leitura do corpo, dependências, validação e serialização da resposta).
+    """
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs) -> None:
+        super().__init__(path, profiled("handler")(endpoint), **kwargs)
+
+    def get_route_handler(self) -> Callable:
+        return profiled("serialization")(super().get_route_handler())
+
+
+def get_route_class() -> type:
+    # Sem profiling, os routers usam a rota padrão do FastAPI
+    return ProfilingRoute if settings.PROFILING_ENABLED else APIRoute
+
+
+# Só um cProfile pode estar ativo por vez no processo
+_cprofile_busy = False
+
+
+def _top_functions(profiler: cProfile.Profile, limit: int) -> List[dict]:
+    stats = pstats.Stats(profiler)
+    stats.sort_stats("cumulative")
+    functions = []
+    for func in stats.fcn_list[:limit]:
+        primitive_calls, calls, total_time, cumulative_time, _ = stats.stats[func]
+        filename, line, name = func
+        functions.append({
+            "function": f"{filename}:{line}({name})",
+            "calls": calls,
+            "tottime_ms": round(total_time * 1000, 3),
+            "cumtime_ms": round(cumulative_time * 1000, 3),
+        })
+    return functions
+
+
+def _write_report(filename: str, report: dict, profiler: Optional[cProfile.Profile]) -> None:
+    os.makedirs(settings.PROFILING_DIR, exist_ok=True)
+    base = os.path.join(settings.PROFILING_DIR, filename)
+    with open(f"{base}.json", "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    # O .prof pode ser aberto com snakeviz ou pstats
+    if profiler is not None:
+        profiler.dump_stats(f"{base}.prof")
+
+
+class ProfilingMiddleware(BaseHTTPMiddleware):
+    """
+    Faz o profile de requisições escolhidas e registra o tempo por camada.
+
+    Uma requisição é medida quando:
+    - traz o cabeçalho X-Profile-Token com o valor de settings.PROFILING_TOKEN:
+      a resposta vira um anexo JSON com o profile (o status original vai em X-Profiled-Status);
+    - ou é sorteada por settings.PROFILING_SAMPLE_RATE: a resposta segue normal
+      e o profile é gravado em settings.PROFILING_DIR.
+
+    Observação: o cProfile mede a thread inteira, então corrotinas de outras
+    requisições executadas no mesmo intervalo também aparecem na lista de funções.
+    """
+
+    async def dispatch(self, request: Request, call_next) -> Response:
+        token = request.headers.get(PROFILE_HEADER)
+        # Comparação em tempo constante (em bytes, para aceitar cabeçalhos não ASCII):
+        # o token libera profiles completos de requisições reais
+        requested = bool(settings.PROFILING_TOKEN) and secrets.compare_digest(
+            (token or "").encode("utf-8"), settings.PROFILING_TOKEN.encode("utf-8")
+        )
+        sampled = not requested and random.random() < settings.PROFILING_SAMPLE_RATE
+        if not (requested or sampled):
+            return await call_next(request)
+
+        global _cprofile_busy
+        profiler = None
+        if not _cprofile_busy:
+            _cprofile_busy = True
+            profiler = cProfile.Profile()
+
+        profile = RequestProfile()
+        context_token = _current_profile.set(profile)
+        start = perf_counter()
+        if profiler is not None:
+            profiler.enable()
+        try:
+            response = await call_next(request)
+            # Consome o corpo aqui dentro para que a serialização entre na medição
+            body = b"".join([chunk async for chunk in response.body_iterator])
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                _cprofile_busy = False
+            total = perf_counter() - start
+            _current_profile.reset(context_token)
+
+        layers = {layer: round(profile.layers.get(layer, 0.0) * 1000, 3) for layer in LAYERS}
+        layers["other"] = round(max(total * 1000 - sum(layers.values()), 0.0), 3)
+        report = {
+            "method": request.method,
+            "path": request.url.path,
+            "status_code": response.status_code,
+            "started_at": datetime.utcnow().isoformat(),
+            "total_ms": round(total * 1000, 3),
+            "layers_ms": layers,
+            "functions": _top_functions(profiler, settings.PROFILING_TOP_FUNCTIONS) if profiler else [],
+        }
+        filename = "{}-{}-{}".format(
+            datetime.utcnow().strftime("%Y%m%dT%H%M%S%f"),
+            request.method.lower(),
+            re.sub(r"[^A-Za-z0-9]+", "_", request.url.path).strip("_") or "root",
+        )
+
+        if requested:
+            return Response(
+                content=json.dumps(report, indent=2),
+                media_type="application/json",
+                headers={
+                    "Content-Disposition": f'attachment; filename="{filename}.json"',
+                    "X-Profiled-Status": str(response.status_code),
+                },
+            )
+
+        await run_in_threadpool(_write_report, filename, report, profiler)
+        return Response(
+            content=body,
+            status_code=response.status_code,
+            headers=dict(response.headers),
+            media_type=response.media_type,
+        )
@@ -0,0 +1,201 @@
+import asyncio
+import json
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from pymongo import monitoring
+from core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+# Comandos que aceitam explain e onde fica o filtro de cada um
+EXPLAINABLE_COMMANDS = {
+    "find": "filter",
+    "aggregate": "pipeline",
+    "count": "query",
+    "distinct": "query",
+    "findAndModify": "query",
+    "delete": "deletes",
+    "update": "updates",
+}
+
+# Campos de sessão/transação que o servidor não aceita dentro de um explain
+_NOT_EXPLAINABLE_FIELDS = {
+    "lsid", "txnNumber", "autocommit", "startTransaction",
+    "readConcern", "writeConcern", "$db", "$clusterTime", "$readPreference",
+}
+
+
+def redact(value: Any) -> Any:
+    """
+    Troca os valores de um filtro por "?" mantendo operadores e campos.
+
+    Exemplo: {"todo_id": UUID(...), "status": {"$in": [True, False]}}
+    vira {"todo_id": "?", "status": {"$in": ["?"]}}.
+    Listas de valores simples viram ["?"] para que o formato não dependa do tamanho.
+    """
+    if isinstance(value, dict):
+        return {key: redact(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        items = [redact(item) for item in value]
+        if all(item == "?" for item in items):
+            return ["?"] if items else []
+        return items
+    return "?"
+
+
+def query_shape(command_name: str, command: dict) -> Any:
+    """
+    Extrai o formato (sem valores) do filtro de um comando.
+    """
+    field = EXPLAINABLE_COMMANDS[command_name]
+    if command_name in ("delete", "update"):
+        # Operações em lote: cada item tem seu próprio filtro em "q"
+        return [redact(op.get("q", {})) for op in command.get(field, [])]
+    shape = {"filter": redact(command.get(field, {}))}
+    if command.get("sort"):
+        shape["sort"] = dict(command["sort"])
+    return shape
+
+
+def _find_key(document: Any, key: str) -> Optional[Any]:
+    # Busca recursiva: o formato do explain muda entre find, aggregate e versões do servidor
+    if isinstance(document, dict):
+        if key in document:
+            return document[key]
+        for value in document.values():
+            found = _find_key(value, key)
+            if found is not None:
+                return found
+    elif isinstance(document, list):
+        for value in document:
+            found = _find_key(value, key)
+            if found is not None:
+                return found
+    return None
+
+
+def _plan_stages(plan: Any) -> List[str]:
+    stages = []
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            stages.append(plan["stage"])
+        for value in plan.values():
+            stages.extend(_plan_stages(value))
+    elif isinstance(plan, list):
+        for value in plan:
+            stages.extend(_plan_stages(value))
+    return stages
+
+
+def summarize_explain(result: dict) -> dict:
+    """
+    Resume a saída de explain("executionStats") nos campos que interessam.
+    """
+    stats = _find_key(result, "executionStats") or {}
+    return {
+        "stages": _plan_stages(_find_key(result, "winningPlan")),
+        "docs_examined": stats.get("totalDocsExamined"),
+        "keys_examined": stats.get("totalKeysExamined"),
+        "returned": stats.get("nReturned"),
+        "execution_ms": stats.get("executionTimeMillis"),
+    }
+
+
+class SlowQueryListener(monitoring.CommandListener):
+    """
+    Listener do PyMongo que mede todos os comandos enviados ao MongoDB.
+
+    Comandos acima de settings.SLOW_QUERY_THRESHOLD_MS são registrados no log com
+    o formato do filtro (valores ocultados), a duração e os documentos examinados.
+    Na primeira vez que um formato de consulta fica lento, roda um
+    explain("executionStats") em segundo plano e guarda o resumo em cache,
+    para que um COLLSCAN apareça no log sem repetir o explain a cada requisição.
+    """
+
+    def __init__(self) -> None:
+        self._pending: Dict[Tuple[int, int], Tuple[str, dict]] = {}
+        self._explained: Dict[str, dict] = {}
+        self._explaining: set = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._client = None
+
+    def bind(self, loop: asyncio.AbstractEventLoop, client) -> None:
+        """
+        Informa o event loop e o cliente Motor usados para rodar os explains.
+        """
+        self._loop = loop
+        self._client = client
+
+    def started(self, event: monitoring.CommandStartedEvent) -> None:
+        if event.command_name in EXPLAINABLE_COMMANDS:
+            self._pending[(event.request_id, event.operation_id)] = (event.database_name, event.command)
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent) -> None:
+        self._finish(event)
+
+    def failed(self, event: monitoring.CommandFailedEvent) -> None:
+        self._finish(event)
+
+    def _finish(self, event) -> None:
+        pending = self._pending.pop((event.request_id, event.operation_id), None)
+        duration_ms = event.duration_micros / 1000
+        if pending is None or duration_ms < settings.SLOW_QUERY_THRESHOLD_MS:
+            return
+
+        database, command = pending
+        collection = command.get(event.command_name)
+        shape = json.dumps(query_shape(event.command_name, command), sort_keys=True, default=str)
+        key = f"{database}.{collection}:{event.command_name}:{shape}"
+        explain = self._explained.get(key)
+
+        logger.warning(
+            "Consulta lenta: %s.%s %s %.1f ms formato=%s docs_examinados=%s plano=%s",
+            database,
+            collection,
+            event.command_name,
+            duration_ms,
+            shape,
+            explain["docs_examined"] if explain else "?",
+            ">".join(explain["stages"]) if explain else "?",
+        )
+
+        if explain is None and settings.SLOW_QUERY_EXPLAIN:
+            self._schedule_explain(key, database, event.command_name, command)
+
+    def _schedule_explain(self, key: str, database: str, command_name: str, command: dict) -> None:
+        if self._loop is None or self._client is None or self._loop.is_closed():
+            return
+        if key in self._explaining or len(self._explained) >= settings.SLOW_QUERY_EXPLAIN_CACHE_SIZE:
+            return
+        self._explaining.add(key)
+        explain_command = {
+            "explain": {name: value for name, value in command.items() if name not in _NOT_EXPLAINABLE_FIELDS},
+            "verbosity": "executionStats",
+        }
+        # O listener roda em uma thread do Motor; o explain é agendado no event loop
+        asyncio.run_coroutine_threadsafe(self._explain(key, database, explain_command), self._loop)
+
+    async def _explain(self, key: str, database: str, explain_command: dict) -> None:
+        try:
+            result = await self._client[database].command(explain_command)
+            summary = summarize_explain(result)
+            self._explained[key] = summary
+            log = logger.warning if "COLLSCAN" in summary["stages"] else logger.info
+            log(
+                "Explain %s: plano=%s docs_examinados=%s chaves_examinadas=%s retornados=%s",
+                key,
+                ">".join(summary["stages"]),
+                summary["docs_examined"],
+                summary["keys_examined"],
+                summary["returned"],
+            )
+        except Exception:
+            logger.exception("Falha ao rodar explain para %s", key)
+        finally:
+            self._explaining.discard(key)
+
+
+# Instância única, registrada no cliente MongoDB em app.py
+slow_query_listener = SlowQueryListener()
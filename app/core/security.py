@@ -1,7 +1,10 @@
+import os
+from functools import lru_cache
 from passlib.context import CryptContext
-from typing import Any,Union, Optional
+from typing import Any, Dict, Union, Optional
 from datetime import datetime, timedelta
-from jose import JWTError, jwt
+from jose import JWTError, jwk, jwt
+from jose.backends.base import Key
 from core.config import settings
 
 
@@ -25,6 +28,98 @@ def verify_password(password: str, hashed_password: str) -> bool:
     """
     return password_context.verify(password, hashed_password)
 
+def is_asymmetric() -> bool:
+    """
+    True quando o access token é assinado com chave privada (ex.: ES256, RS256)
+    em vez do segredo compartilhado (HS256).
+    """
+    return not settings.ALGORITHM.upper().startswith("HS")
+
+
+@lru_cache(maxsize=None)
+def _signing_keys() -> Dict[str, Key]:
+    """
+    Carrega (uma única vez) as chaves privadas de settings.JWT_KEYS_DIR.
+
+    Cada arquivo `<kid>.pem` vira uma chave já interpretada, identificada pelo nome do arquivo.
+    Para rotacionar: adicione a nova chave, aponte JWT_ACTIVE_KID para ela e só remova a antiga
+    depois que os tokens assinados com ela expirarem.
+    """
+    keys = {}
+    for filename in sorted(os.listdir(settings.JWT_KEYS_DIR)):
+        if filename.endswith(".pem"):
+            with open(os.path.join(settings.JWT_KEYS_DIR, filename), "rb") as f:
+                keys[filename[:-4]] = jwk.construct(f.read(), settings.ALGORITHM)
+    if not keys:
+        raise RuntimeError(f"Nenhuma chave .pem encontrada em {settings.JWT_KEYS_DIR!r}")
+    return keys
+
+
+@lru_cache(maxsize=None)
+def _verification_keys() -> Dict[str, Key]:
+    # Só as partes públicas, já interpretadas, por kid
+    return {kid: key.public_key() for kid, key in _signing_keys().items()}
+
+
+@lru_cache(maxsize=None)
+def _active_kid() -> str:
+    kid = settings.JWT_ACTIVE_KID or list(_signing_keys())[-1]
+    if kid not in _signing_keys():
+        raise RuntimeError(f"JWT_ACTIVE_KID {kid!r} não encontrado em {settings.JWT_KEYS_DIR!r}")
+    return kid
+
+
+@lru_cache(maxsize=None)
+def _secret_key(secret: str, algorithm: str) -> Key:
+    # Mesmo no HS256 a chave é interpretada uma vez só, e não a cada token
+    return jwk.construct(secret, algorithm)
+
+
+def _refresh_algorithm() -> str:
+    # O refresh token só é verificado por esta API, então continua com segredo compartilhado
+    return settings.ALGORITHM if not is_asymmetric() else "HS256"
+
+
+def decode_access_token(token: str) -> Dict[str, Any]:
+    """
+    Valida a assinatura do access token e retorna suas claims.
+
+    Com algoritmo assimétrico, a chave pública é escolhida pelo `kid` do cabeçalho do token.
+    Lança jose.JWTError se o token for inválido.
+    """
+    if not is_asymmetric():
+        key = _secret_key(settings.JWT_SECRET_KEY, settings.ALGORITHM)
+    else:
+        kid = jwt.get_unverified_header(token).get("kid")
+        key = _verification_keys().get(kid)
+        if key is None:
+            raise JWTError("Chave de assinatura desconhecida")
+    return jwt.decode(token, key, algorithms=[settings.ALGORITHM])
+
+
+def decode_refresh_token(token: str) -> Dict[str, Any]:
+    """
+    Valida a assinatura do refresh token e retorna suas claims.
+    """
+    key = _secret_key(settings.JWT_REFRESH_SECRET_KEY, _refresh_algorithm())
+    return jwt.decode(token, key, algorithms=[_refresh_algorithm()])
+
+
+def jwks() -> Dict[str, Any]:
+    """
+    Chaves públicas no formato JWKS (RFC 7517), para que outros serviços validem
+    nossos access tokens sem conhecer nenhum segredo. Vazio quando o algoritmo é HS*.
+    """
+    if not is_asymmetric():
+        return {"keys": []}
+    return {
+        "keys": [
+            {**key.to_dict(), "kid": kid, "use": "sig", "alg": settings.ALGORITHM}
+            for kid, key in _verification_keys().items()
+        ]
+    }
+
+
 def create_access_token(
     subject: Union[str, Any],
     expires_delta: Optional[Union[int, timedelta]] = None
@@ -48,7 +143,8 @@ def create_access_token(
         - sub: subject (string)
         - iat: instante de emissão (UTC)
         - exp: instante de expiração (UTC)
-    - A assinatura usa settings.JWT_SECRET_KEY e settings.ALGORITHM.
+    - A assinatura usa settings.ALGORITHM: com HS* usa settings.JWT_SECRET_KEY; com algoritmos
+      assimétricos (ES256, RS256...) usa a chave privada JWT_ACTIVE_KID de JWT_KEYS_DIR.
     """
     # Determina a duração do token a partir do parâmetro recebido ou da configuração padrão.
     if expires_delta is not None:
@@ -66,10 +162,20 @@ def create_access_token(
         "exp": expires_at     # instante de expiração
     }
 
-    # Assina o token com a chave secreta e algoritmo definidos nas configurações
+    # Assina o token com a chave ativa (assimétrico, com o kid no cabeçalho)
+    # ou com a chave secreta, conforme o algoritmo definido nas configurações
+    if is_asymmetric():
+        kid = _active_kid()
+        return jwt.encode(
+            info_jwt,
+            _signing_keys()[kid],
+            algorithm=settings.ALGORITHM,
+            headers={"kid": kid}
+        )
+
     jwt_encoded = jwt.encode(
         info_jwt,
-        settings.JWT_SECRET_KEY,
+        _secret_key(settings.JWT_SECRET_KEY, settings.ALGORITHM),
         algorithm=settings.ALGORITHM
     )
 
@@ -99,8 +205,8 @@ def create_refresh_token(
     # Assina o token com a chave secreta e algoritmo definidos nas configurações
     jwt_encoded = jwt.encode(
         info_jwt,
-        settings.JWT_REFRESH_SECRET_KEY,
-        algorithm=settings.ALGORITHM
+        _secret_key(settings.JWT_REFRESH_SECRET_KEY, _refresh_algorithm()),
+        algorithm=_refresh_algorithm()
     )
 
     return jwt_encoded
\ No newline at end of file
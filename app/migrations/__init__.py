@@ -0,0 +1 @@
+# Torna a pasta 'migrations' um pacote Python
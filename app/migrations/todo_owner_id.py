@@ -0,0 +1,105 @@
+"""
+Migração: preenche Todo.owner_id a partir do DBRef antigo Todo.owner.
+
+Uso (a partir da pasta app):
+    python -m migrations.todo_owner_id [--batch-size 500]
+
+A migração roda em lotes ordenados por _id e grava um checkpoint na coleção
+'migrations' ao fim de cada lote. Se for interrompida, basta rodar de novo:
+ela continua do último lote confirmado. Rodar depois de concluída não altera nada.
+"""
+import argparse
+import asyncio
+from datetime import datetime
+
+from beanie import init_beanie
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import UpdateOne
+
+from core.config import settings
+from models.todo_model import Todo
+from models.user_model import User
+
+
+MIGRATION_ID = "todo_owner_id"
+
+
+async def backfill_owner_id(database, batch_size: int = 500) -> int:
+    """
+    Copia o user_id do dono para o campo owner_id das tarefas antigas.
+
+    Parâmetros:
+    - database: banco do Motor (ex.: client.todoapp), já inicializado com o Beanie.
+    - batch_size: quantidade de tarefas lidas e atualizadas por lote.
+
+    Retorno:
+    - Quantidade de tarefas atualizadas nesta execução.
+    """
+    todos = Todo.get_motor_collection()
+    users = User.get_motor_collection()
+    checkpoints = database["migrations"]
+
+    checkpoint = await checkpoints.find_one({"_id": MIGRATION_ID}) or {}
+    last_id = checkpoint.get("last_id")
+    migrated = 0
+
+    while True:
+        query = {"owner_id": None, "owner": {"$exists": True}}
+        if last_id is not None:
+            query["_id"] = {"$gt": last_id}
+        batch = await todos.find(query, {"_id": 1, "owner": 1}) \
+            .sort("_id", 1).limit(batch_size).to_list(length=batch_size)
+        if not batch:
+            break
+
+        # Um único $in para descobrir o user_id de todos os donos do lote
+        owner_refs = {doc["owner"].id for doc in batch}
+        user_ids = {
+            user["_id"]: user["user_id"]
+            async for user in users.find({"_id": {"$in": list(owner_refs)}}, {"user_id": 1})
+        }
+
+        operations = [
+            UpdateOne(
+                {"_id": doc["_id"], "owner_id": None},
+                {"$set": {"owner_id": user_ids[doc["owner"].id]}}
+            )
+            for doc in batch
+            if doc["owner"].id in user_ids
+        ]
+        if operations:
+            result = await todos.bulk_write(operations, ordered=False)
+            migrated += result.modified_count
+
+        last_id = batch[-1]["_id"]
+        await checkpoints.update_one(
+            {"_id": MIGRATION_ID},
+            {
+                "$set": {"last_id": last_id, "updated_at": datetime.utcnow()},
+                "$inc": {"migrated": len(operations)},
+            },
+            upsert=True
+        )
+        print(f"Lote concluído até _id={last_id} ({migrated} tarefas atualizadas)")
+
+    await checkpoints.update_one(
+        {"_id": MIGRATION_ID},
+        {"$set": {"completed_at": datetime.utcnow()}},
+        upsert=True
+    )
+    return migrated
+
+
+async def main(batch_size: int) -> None:
+    database = AsyncIOMotorClient(settings.MONGO_CONNECTION_STRING).todoapp
+    # init_beanie também cria o índice de owner_id, se ainda não existir
+    await init_beanie(database=database, document_models=[User, Todo])
+    migrated = await backfill_owner_id(database, batch_size)
+    print(f"Migração {MIGRATION_ID} concluída: {migrated} tarefas atualizadas")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Preenche Todo.owner_id a partir de Todo.owner")
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(main(args.batch_size))
@@ -0,0 +1,36 @@
+from datetime import datetime
+from typing import Optional
+
+import pymongo
+from beanie import Document
+from pydantic import Field
+from core.config import settings
+
+
+class IdempotencyRecord(Document):
+    """
+    Resposta guardada de uma escrita feita com o cabeçalho Idempotency-Key.
+
+    Uma nova requisição com a mesma chave recebe esta resposta em vez de executar a
+    escrita de novo. O MongoDB apaga os registros sozinho depois de
+    settings.IDEMPOTENCY_TTL_SECONDS (índice TTL em created_at).
+    """
+    # "<user_id>:<Idempotency-Key>": a chave vale só para o usuário que a enviou
+    key: str
+    # Hash do método, rota e corpo da requisição original
+    fingerprint: str
+    status_code: int
+    body: bytes = b""
+    media_type: Optional[str] = None
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+    class Settings:
+        name = "idempotency_keys"
+        indexes = [
+            pymongo.IndexModel([("key", pymongo.ASCENDING)], name="key_unique", unique=True),
+            pymongo.IndexModel(
+                [("created_at", pymongo.ASCENDING)],
+                name="created_at_ttl",
+                expireAfterSeconds=settings.IDEMPOTENCY_TTL_SECONDS,
+            ),
+        ]
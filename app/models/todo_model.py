@@ -2,6 +2,7 @@ from typing import Optional
 from datetime import datetime
 from uuid import UUID, uuid4
 from beanie import Document, Indexed, before_event, Link, Replace, Insert
+import pymongo
 from pydantic import Field
 from .user_model import User
 from pydantic import BaseModel
@@ -20,7 +21,35 @@ class Todo(Document):
     description: Optional[str] = None
     created_at: datetime = Field(default_factory=datetime.utcnow)
     update_at: datetime = Field(default_factory=datetime.utcnow)
-    owner: Link[User] # Em Java(Spring), seria @ManyToOne
+    # Dono da tarefa (User.user_id). Campo simples em vez de um DBRef; é o prefixo
+    # de todos os índices compostos declarados em Settings
+    owner_id: Optional[UUID] = None
+    # Legado: referência ao User (DBRef) usada antes do owner_id. Só existe em documentos
+    # antigos até a migração migrations.todo_owner_id preencher o owner_id
+    owner: Optional[Link[User]] = None # Em Java(Spring), seria @ManyToOne
+
+    class Settings:
+        indexes = [
+            # Índices da listagem (GET /todo/): igualdade (owner_id, status) antes do campo
+            # de ordenação, que também atende o intervalo de created_at.
+            # Ver LIST_QUERY_INDEXES para as combinações que cada um atende.
+            pymongo.IndexModel([("owner_id", pymongo.ASCENDING), ("created_at", pymongo.ASCENDING)], name="owner_created"),
+            pymongo.IndexModel([("owner_id", pymongo.ASCENDING), ("status", pymongo.ASCENDING), ("created_at", pymongo.ASCENDING)], name="owner_status_created"),
+            pymongo.IndexModel([("owner_id", pymongo.ASCENDING), ("update_at", pymongo.ASCENDING)], name="owner_updated"),
+            pymongo.IndexModel([("owner_id", pymongo.ASCENDING), ("status", pymongo.ASCENDING), ("update_at", pymongo.ASCENDING)], name="owner_status_updated"),
+            pymongo.IndexModel([("owner_id", pymongo.ASCENDING), ("title", pymongo.ASCENDING)], name="owner_title"),
+            pymongo.IndexModel([("owner_id", pymongo.ASCENDING), ("status", pymongo.ASCENDING), ("title", pymongo.ASCENDING)], name="owner_status_title"),
+            # Os mesmos índices com o DBRef antigo (owner.$id), para o ramo de compatibilidade
+            # da consulta (settings.TODO_OWNER_COMPAT_READS). Com eles, cada ramo do $or usa
+            # um índice composto e o MongoDB junta os dois já ordenados (SORT_MERGE).
+            # Podem ser removidos depois que todos os documentos tiverem owner_id
+            pymongo.IndexModel([("owner.$id", pymongo.ASCENDING), ("created_at", pymongo.ASCENDING)], name="legacy_owner_created"),
+            pymongo.IndexModel([("owner.$id", pymongo.ASCENDING), ("status", pymongo.ASCENDING), ("created_at", pymongo.ASCENDING)], name="legacy_owner_status_created"),
+            pymongo.IndexModel([("owner.$id", pymongo.ASCENDING), ("update_at", pymongo.ASCENDING)], name="legacy_owner_updated"),
+            pymongo.IndexModel([("owner.$id", pymongo.ASCENDING), ("status", pymongo.ASCENDING), ("update_at", pymongo.ASCENDING)], name="legacy_owner_status_updated"),
+            pymongo.IndexModel([("owner.$id", pymongo.ASCENDING), ("title", pymongo.ASCENDING)], name="legacy_owner_title"),
+            pymongo.IndexModel([("owner.$id", pymongo.ASCENDING), ("status", pymongo.ASCENDING), ("title", pymongo.ASCENDING)], name="legacy_owner_status_title"),
+        ]
 
 
 
@@ -90,6 +119,51 @@ class Todo(Document):
             return self.todo_id == other.todo_id
         return False
 
+# Prefixo do índice equivalente com owner.$id, usado pelo ramo de compatibilidade da listagem
+LEGACY_INDEX_PREFIX = "legacy_"
+
+# Combinações de filtro/ordenação aceitas na listagem e o índice que atende cada uma:
+# (filtra por status?, filtra por intervalo de created_at?, campo de ordenação) -> índice.
+# O intervalo de created_at só é aceito quando created_at também é a ordenação (ou não há
+# ordenação): com outro campo de ordenação, o MongoDB teria de ordenar em memória.
+LIST_QUERY_INDEXES = {
+    (False, False, None): "owner_created",
+    (False, True, None): "owner_created",
+    (True, False, None): "owner_status_created",
+    (True, True, None): "owner_status_created",
+    (False, False, "created_at"): "owner_created",
+    (False, True, "created_at"): "owner_created",
+    (True, False, "created_at"): "owner_status_created",
+    (True, True, "created_at"): "owner_status_created",
+    (False, False, "update_at"): "owner_updated",
+    (True, False, "update_at"): "owner_status_updated",
+    (False, False, "title"): "owner_title",
+    (True, False, "title"): "owner_status_title",
+}
+
+
+def list_query_index(status: Optional[bool], created_range: bool, sort_field: Optional[str]) -> str:
+    """
+    Retorna o nome do índice que atende a combinação de filtros e ordenação da listagem.
+
+    Lança ValueError se a combinação não tiver índice declarado.
+    """
+    index = LIST_QUERY_INDEXES.get((status is not None, created_range, sort_field))
+    if index is None:
+        raise ValueError(
+            f"Combinação não suportada: o filtro por created_at só pode ser usado "
+            f"com ordenação por created_at (recebido sort={sort_field})."
+        )
+    return index
+
+
+def legacy_index(index: str) -> str:
+    """
+    Nome do índice equivalente com owner.$id (ex.: owner_created -> legacy_owner_created).
+    """
+    return LEGACY_INDEX_PREFIX + index
+
+
 # A função abaixo é
 # um "hook" que atualiza o campo `update_at` sempre que o documento é atualizado ou inserido.
 # Em java, seria algo como um @PreUpdate ou @PrePersist.
@@ -0,0 +1,27 @@
+# Camada de repositórios: os services acessam o armazenamento só por aqui.
+# O backend é escolhido por settings.REPOSITORY_BACKEND ("beanie" ou "memory").
+from core.config import settings
+from repositories.base import IdempotencyRepository, TodoRepository, UserRepository
+
+
+def _build_repositories():
+    if settings.REPOSITORY_BACKEND == "memory":
+        from repositories.memory_repository import (
+            MemoryIdempotencyRepository, MemoryTodoRepository, MemoryUserRepository,
+        )
+        return MemoryTodoRepository(), MemoryUserRepository(), MemoryIdempotencyRepository()
+    if settings.REPOSITORY_BACKEND == "beanie":
+        from repositories.beanie_repository import (
+            BeanieIdempotencyRepository, BeanieTodoRepository, BeanieUserRepository,
+        )
+        return BeanieTodoRepository(), BeanieUserRepository(), BeanieIdempotencyRepository()
+    raise ValueError(f"REPOSITORY_BACKEND inválido: {settings.REPOSITORY_BACKEND!r}")
+
+
+# Instâncias únicas, usadas pelos services
+todo_repository, user_repository, idempotency_repository = _build_repositories()
+
+__all__ = [
+    "IdempotencyRepository", "TodoRepository", "UserRepository",
+    "idempotency_repository", "todo_repository", "user_repository",
+]
@@ -0,0 +1,103 @@
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import AsyncIterator, List, Optional, Tuple
+from uuid import UUID
+
+from models.idempotency_model import IdempotencyRecord
+from models.todo_model import Todo
+from models.user_model import User
+from schemas.todo_schema import TodoListQuery
+
+
+# Interfaces dos repositórios: tudo o que os services precisam do armazenamento.
+# Em Java, seriam as interfaces do Spring Data (ex.: TodoRepository extends CrudRepository).
+#
+# Os parâmetros `read` e `write` são nomes de perfis de consistência
+# (settings.DB_READ_PROFILES / settings.DB_WRITE_PROFILES); implementações que não
+# têm esse conceito (ex.: em memória) podem ignorá-los.
+
+
+class TodoRepository(ABC):
+
+    @abstractmethod
+    async def list_by_owner(
+        self,
+        user: User,
+        query: TodoListQuery,
+        read: Optional[str] = None,
+        index: Optional[str] = None,
+    ) -> List[Todo]:
+        """
+        Tarefas do usuário, com os filtros e a ordenação de `query`.
+        `index` é o índice que atende a consulta (ver models.todo_model.list_query_index).
+        """
+
+    @abstractmethod
+    async def get(self, user: User, todo_id: UUID) -> Optional[Todo]:
+        """Uma tarefa do usuário pelo ID, ou None se não existir ou for de outro dono."""
+
+    @abstractmethod
+    async def get_many(self, user: User, todo_ids: List[UUID]) -> List[Todo]:
+        """Tarefas do usuário cujos IDs estão em `todo_ids` (em qualquer ordem)."""
+
+    @abstractmethod
+    async def create(self, user: User, data: dict) -> Todo:
+        """Cria e persiste uma tarefa do usuário com os campos já validados em `data`."""
+
+    @abstractmethod
+    async def create_many(self, user: User, items: List[dict]) -> Tuple[int, List[Tuple[int, str]]]:
+        """
+        Cria várias tarefas do usuário de uma vez, sem parar no primeiro erro.
+        Retorna a quantidade inserida e os erros como (posição em `items`, mensagem).
+        """
+
+    @abstractmethod
+    async def update(self, todo: Todo, changes: dict, write: Optional[str] = None) -> Todo:
+        """Aplica `changes` na tarefa e persiste."""
+
+    @abstractmethod
+    async def delete(self, todo: Todo) -> None:
+        """Remove a tarefa."""
+
+
+class UserRepository(ABC):
+
+    @abstractmethod
+    async def create(self, data: dict, write: Optional[str] = None) -> User:
+        """
+        Cria e persiste um usuário.
+        Deve lançar pymongo.errors.DuplicateKeyError se o username ou email já existir.
+        """
+
+    @abstractmethod
+    async def get_by_id(self, user_id: UUID) -> Optional[User]:
+        """Usuário pelo user_id."""
+
+    @abstractmethod
+    async def get_by_email(self, email: str) -> Optional[User]:
+        """Usuário pelo email."""
+
+    @abstractmethod
+    async def get_by_username(self, username: str) -> Optional[User]:
+        """Usuário pelo username."""
+
+    @abstractmethod
+    def iter_identities(self, since: Optional[datetime] = None) -> AsyncIterator[Tuple[str, str]]:
+        """
+        Percorre (username, email) de todos os usuários, ou só dos criados a partir de
+        `since` (UTC, pela data de geração do ObjectId, como em User.create).
+        """
+
+
+class IdempotencyRepository(ABC):
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[IdempotencyRecord]:
+        """Resposta guardada para a chave, ou None se não existir ou já tiver expirado."""
+
+    @abstractmethod
+    async def save(self, data: dict) -> IdempotencyRecord:
+        """
+        Guarda a resposta de uma escrita idempotente.
+        Deve lançar pymongo.errors.DuplicateKeyError se a chave já tiver uma resposta.
+        """
@@ -0,0 +1,184 @@
+from datetime import datetime, timedelta
+from typing import AsyncIterator, List, Optional, Tuple
+from uuid import UUID
+
+import pymongo
+from bson import ObjectId
+from beanie.operators import And, In, Or
+from pymongo.errors import BulkWriteError
+
+from core import db_profiles
+from core.config import settings
+from models.idempotency_model import IdempotencyRecord
+from models.todo_model import Todo
+from models.user_model import User
+from repositories.base import IdempotencyRepository, TodoRepository, UserRepository
+from schemas.todo_schema import TodoListQuery
+
+
+def owner_filter(user: User):
+    """
+    Filtro de propriedade usado por todas as consultas de tarefas.
+
+    As tarefas novas guardam o dono em `owner_id` (campo indexado). Enquanto a migração
+    `migrations.todo_owner_id` não terminar, documentos antigos ainda só têm o `owner`
+    (DBRef), então também aceitamos `owner.$id` (settings.TODO_OWNER_COMPAT_READS).
+    """
+    if settings.TODO_OWNER_COMPAT_READS:
+        return Or(Todo.owner_id == user.user_id, Todo.owner.id == user.id)
+    return Todo.owner_id == user.user_id
+
+
+def list_filter(user: User, query: TodoListQuery) -> list:
+    """
+    Condições da listagem (GET /todo/), na ordem dos índices compostos de Todo:
+    igualdades (dono, status) primeiro, depois o intervalo de created_at.
+
+    Com settings.TODO_OWNER_COMPAT_READS, status e created_at são repetidos dentro de cada
+    ramo do $or (owner_id e owner.$id), para que cada ramo seja atendido pelo seu índice
+    composto (ex.: owner_status_created e legacy_owner_status_created) sem ordenação em memória.
+    """
+    conditions = []
+    if query.status is not None:
+        conditions.append(Todo.status == query.status)
+    if query.created_after is not None:
+        conditions.append(Todo.created_at >= query.created_after)
+    if query.created_before is not None:
+        conditions.append(Todo.created_at < query.created_before)
+
+    if settings.TODO_OWNER_COMPAT_READS:
+        return [Or(
+            And(Todo.owner_id == user.user_id, *conditions),
+            And(Todo.owner.id == user.id, *conditions),
+        )]
+    return [Todo.owner_id == user.user_id, *conditions]
+
+
+def list_sort(query: TodoListQuery) -> List[Tuple[str, int]]:
+    """
+    Ordenação da listagem no formato do PyMongo.
+
+    Sem ordenação pedida, usa created_at crescente (ordem de criação, como no backend em
+    memória): assim o plano é sempre o índice *_created de LIST_QUERY_INDEXES, e não
+    qualquer índice que comece pelo dono.
+    """
+    if not query.sort_field:
+        return [("created_at", pymongo.ASCENDING)]
+    direction = pymongo.DESCENDING if query.descending else pymongo.ASCENDING
+    return [(query.sort_field, direction)]
+
+
+class BeanieTodoRepository(TodoRepository):
+    """
+    Tarefas no MongoDB, via Beanie.
+    """
+
+    async def list_by_owner(
+        self,
+        user: User,
+        query: TodoListQuery,
+        read: Optional[str] = None,
+        index: Optional[str] = None,
+    ) -> List[Todo]:
+        conditions = list_filter(user, query)
+        sort = list_sort(query)
+        # Sem o ramo de compatibilidade, o índice é forçado com hint. Com ele não dá para
+        # usar hint (cada ramo do $or usa um índice diferente); os testes em
+        # tests/test_list_query_indexes.py conferem o plano escolhido pelo MongoDB
+        hint = None if settings.TODO_OWNER_COMPAT_READS else index
+
+        if read is None:
+            return await Todo.find(*conditions, sort=sort, hint=hint).to_list()
+        filter_query = Todo.find(*conditions).get_filter_query()
+        return await db_profiles.find_all(Todo, filter_query, read=read, sort=sort, hint=hint)
+
+    async def get(self, user: User, todo_id: UUID) -> Optional[Todo]:
+        return await Todo.find_one(
+            Todo.todo_id == todo_id,
+            owner_filter(user)
+        )
+
+    async def get_many(self, user: User, todo_ids: List[UUID]) -> List[Todo]:
+        # Uma única consulta com $in, filtrada pelo dono
+        return await Todo.find(
+            In(Todo.todo_id, todo_ids),
+            owner_filter(user)
+        ).to_list()
+
+    async def create(self, user: User, data: dict) -> Todo:
+        # Em java, seria algo como new Todo(data.getTitle(), data.getDescription(), user.getUserId())
+        todo = Todo(**data, owner_id=user.user_id)
+        # O método insert() salva o documento na coleção e retorna a própria instância já persistida.
+        return await todo.insert()
+
+    async def create_many(self, user: User, items: List[dict]) -> Tuple[int, List[Tuple[int, str]]]:
+        todos = [Todo(**data, owner_id=user.user_id) for data in items]
+        try:
+            # ordered=False: um documento com erro não impede a inserção dos demais
+            result = await Todo.insert_many(todos, ordered=False)
+            return len(result.inserted_ids), []
+        except BulkWriteError as e:
+            errors = [(error["index"], error["errmsg"]) for error in e.details.get("writeErrors", [])]
+            return e.details.get("nInserted", 0), errors
+
+    async def update(self, todo: Todo, changes: dict, write: Optional[str] = None) -> Todo:
+        changes = {**changes, "update_at": datetime.utcnow()}
+        # Atualiza os campos informados em uma única escrita no banco
+        await db_profiles.collection(Todo, write=write).update_one(
+            {"_id": todo.id},
+            {"$set": changes}
+        )
+        for field, value in changes.items():
+            setattr(todo, field, value)
+        return todo
+
+    async def delete(self, todo: Todo) -> None:
+        await todo.delete()
+
+
+class BeanieUserRepository(UserRepository):
+    """
+    Usuários no MongoDB, via Beanie. Os índices únicos de username e email
+    garantem o DuplicateKeyError.
+    """
+
+    async def create(self, data: dict, write: Optional[str] = None) -> User:
+        usuario = User(**data)
+        if write is None:
+            return await usuario.insert()
+        return await db_profiles.insert(usuario, write=write)
+
+    async def get_by_id(self, user_id: UUID) -> Optional[User]:
+        return await User.find_one(User.user_id == user_id)
+
+    async def get_by_email(self, email: str) -> Optional[User]:
+        return await User.find_one(User.email == email)
+
+    async def get_by_username(self, username: str) -> Optional[User]:
+        return await User.find_one(User.username == username)
+
+    async def iter_identities(self, since: Optional[datetime] = None) -> AsyncIterator[Tuple[str, str]]:
+        # O _id (ObjectId) começa pela data de criação: o intervalo usa o índice do _id
+        query = {"_id": {"$gte": ObjectId.from_datetime(since)}} if since is not None else {}
+        # Projeção: só os dois campos, sem montar documentos User
+        cursor = User.get_motor_collection().find(query, {"username": 1, "email": 1, "_id": 0})
+        async for data in cursor:
+            yield data["username"], data["email"]
+
+
+class BeanieIdempotencyRepository(IdempotencyRepository):
+    """
+    Respostas idempotentes no MongoDB. O índice único em `key` impede duas respostas
+    para a mesma chave e o índice TTL em `created_at` apaga as antigas.
+    """
+
+    async def get(self, key: str) -> Optional[IdempotencyRecord]:
+        # O TTL do MongoDB roda a cada 60 segundos; o filtro de data cobre esse intervalo
+        expired_before = datetime.utcnow() - timedelta(seconds=settings.IDEMPOTENCY_TTL_SECONDS)
+        return await IdempotencyRecord.find_one(
+            IdempotencyRecord.key == key,
+            IdempotencyRecord.created_at > expired_before,
+        )
+
+    async def save(self, data: dict) -> IdempotencyRecord:
+        return await IdempotencyRecord(**data).insert()
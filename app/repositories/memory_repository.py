@@ -0,0 +1,144 @@
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from bson import ObjectId
+from pymongo.errors import DuplicateKeyError
+
+from core.config import settings
+from core.profiling import profiled
+from models.idempotency_model import IdempotencyRecord
+from models.todo_model import Todo
+from models.user_model import User
+from repositories.base import IdempotencyRepository, TodoRepository, UserRepository
+from schemas.todo_schema import TodoListQuery
+
+
+# Implementação em memória, para rodar (e medir) a API sem MongoDB.
+#
+# Os documentos do Beanie só podem ser instanciados com __init__ depois do init_beanie,
+# por isso aqui eles são montados com model_construct() a partir de dados já validados
+# pelos schemas. Os perfis de leitura/escrita não se aplicam e são ignorados.
+# Os métodos contam como camada "db" no profiling, para separar o custo dos services.
+
+
+class MemoryTodoRepository(TodoRepository):
+
+    def __init__(self) -> None:
+        # owner_id -> {todo_id: Todo}, na ordem de criação (como a ordem natural do MongoDB)
+        self._by_owner: Dict[UUID, Dict[UUID, Todo]] = defaultdict(dict)
+
+    @profiled("db")
+    async def list_by_owner(
+        self,
+        user: User,
+        query: TodoListQuery,
+        read: Optional[str] = None,
+        index: Optional[str] = None,
+    ) -> List[Todo]:
+        todos = [
+            todo for todo in self._by_owner.get(user.user_id, {}).values()
+            if (query.status is None or todo.status == query.status)
+            and (query.created_after is None or todo.created_at >= query.created_after)
+            and (query.created_before is None or todo.created_at < query.created_before)
+        ]
+        if query.sort_field:
+            todos.sort(key=lambda todo: getattr(todo, query.sort_field), reverse=query.descending)
+        return todos
+
+    @profiled("db")
+    async def get(self, user: User, todo_id: UUID) -> Optional[Todo]:
+        return self._by_owner.get(user.user_id, {}).get(todo_id)
+
+    @profiled("db")
+    async def get_many(self, user: User, todo_ids: List[UUID]) -> List[Todo]:
+        owned = self._by_owner.get(user.user_id, {})
+        return [owned[todo_id] for todo_id in todo_ids if todo_id in owned]
+
+    @profiled("db")
+    async def create(self, user: User, data: dict) -> Todo:
+        todo = Todo.model_construct(**data, owner_id=user.user_id)
+        self._by_owner[user.user_id][todo.todo_id] = todo
+        return todo
+
+    @profiled("db")
+    async def create_many(self, user: User, items: List[dict]) -> Tuple[int, List[Tuple[int, str]]]:
+        owned = self._by_owner[user.user_id]
+        for data in items:
+            todo = Todo.model_construct(**data, owner_id=user.user_id)
+            owned[todo.todo_id] = todo
+        return len(items), []
+
+    @profiled("db")
+    async def update(self, todo: Todo, changes: dict, write: Optional[str] = None) -> Todo:
+        for field, value in {**changes, "update_at": datetime.utcnow()}.items():
+            setattr(todo, field, value)
+        return todo
+
+    @profiled("db")
+    async def delete(self, todo: Todo) -> None:
+        self._by_owner.get(todo.owner_id, {}).pop(todo.todo_id, None)
+
+
+class MemoryUserRepository(UserRepository):
+
+    def __init__(self) -> None:
+        self._by_id: Dict[UUID, User] = {}
+        # Equivalentes aos índices únicos de username e email
+        self._by_email: Dict[str, User] = {}
+        self._by_username: Dict[str, User] = {}
+
+    @profiled("db")
+    async def create(self, data: dict, write: Optional[str] = None) -> User:
+        if data["username"] in self._by_username or data["email"] in self._by_email:
+            raise DuplicateKeyError("Username or email already exists.")
+        # O ObjectId guarda a data de criação (User.create e iter_identities usam)
+        usuario = User.model_construct(**data, id=ObjectId())
+        self._by_id[usuario.user_id] = usuario
+        self._by_email[usuario.email] = usuario
+        self._by_username[usuario.username] = usuario
+        return usuario
+
+    @profiled("db")
+    async def get_by_id(self, user_id: UUID) -> Optional[User]:
+        return self._by_id.get(user_id)
+
+    @profiled("db")
+    async def get_by_email(self, email: str) -> Optional[User]:
+        return self._by_email.get(email)
+
+    @profiled("db")
+    async def get_by_username(self, username: str) -> Optional[User]:
+        return self._by_username.get(username)
+
+    async def iter_identities(self, since: Optional[datetime] = None) -> AsyncIterator[Tuple[str, str]]:
+        start = ObjectId.from_datetime(since) if since is not None else None
+        for usuario in list(self._by_id.values()):
+            if start is None or usuario.id >= start:
+                yield usuario.username, usuario.email
+
+
+class MemoryIdempotencyRepository(IdempotencyRepository):
+
+    def __init__(self) -> None:
+        self._by_key: Dict[str, IdempotencyRecord] = {}
+
+    @profiled("db")
+    async def get(self, key: str) -> Optional[IdempotencyRecord]:
+        record = self._by_key.get(key)
+        if record is None:
+            return None
+        # Equivalente ao índice TTL
+        if record.created_at < datetime.utcnow() - timedelta(seconds=settings.IDEMPOTENCY_TTL_SECONDS):
+            del self._by_key[key]
+            return None
+        return record
+
+    @profiled("db")
+    async def save(self, data: dict) -> IdempotencyRecord:
+        if await self.get(data["key"]) is not None:
+            raise DuplicateKeyError("Idempotency key already exists.")
+        record = IdempotencyRecord.model_construct(created_at=datetime.utcnow(), **data)
+        self._by_key[record.key] = record
+        return record
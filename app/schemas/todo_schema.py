@@ -1,7 +1,8 @@
-from pydantic import BaseModel, ConfigDict, Field
-from typing import Optional
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+from typing import List, Literal, Optional
 from uuid import UUID
-from datetime import datetime
+from datetime import datetime, timezone
+from core.config import settings
 
 # Modelo para criação de uma nova tarefa (todo)
 class TodoCreate(BaseModel):
@@ -25,9 +26,9 @@ class TodoCreate(BaseModel):
 # Modelo para atualização de uma tarefa existente
 class TodoUpdate(BaseModel):
     # Título pode ser atualizado, mas não é obrigatório
-    title: Optional[str]
+    title: Optional[str] = None
     # Descrição pode ser atualizada, mas não é obrigatória
-    description: Optional[str]
+    description: Optional[str] = None
     # Status pode ser atualizado, padrão é False se não fornecido
     status: Optional[bool] = False
 
@@ -45,8 +46,61 @@ class TodoDetail(BaseModel):
     created_at: datetime
     # Data da última atualização da tarefa
     update_at: datetime
-    # # Identificador do dono/usuário da tarefa
-    # owner_id: UUID
+    # Identificador do dono/usuário da tarefa (None em tarefas antigas ainda não migradas)
+    owner_id: Optional[UUID] = None
 
     # Trocar Config.orm_mode para model_config (Pydantic v2)
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+# Modelo para busca de várias tarefas de uma vez (POST /todo/batch-get)
+class TodoBatchGet(BaseModel):
+    # IDs das tarefas desejadas, na ordem em que devem ser retornadas
+    todo_ids: List[UUID] = Field(
+        ...,
+        description="IDs das tarefas a buscar",
+        min_length=1,
+        max_length=settings.TODO_BATCH_MAX_IDS
+    )
+
+# Modelo de resposta da busca em lote
+class TodoBatchResult(BaseModel):
+    # Tarefas encontradas, na mesma ordem dos IDs pedidos
+    found: List[TodoDetail]
+    # IDs que não existem ou não pertencem ao usuário
+    missing: List[UUID]
+
+
+# Campos aceitos na ordenação da listagem; prefixo "-" para ordem decrescente
+TodoSort = Literal["created_at", "-created_at", "update_at", "-update_at", "title", "-title"]
+
+# Filtros e ordenação da listagem (GET /todo/)
+class TodoListQuery(BaseModel):
+    # Filtra por status (True para concluídas, False para pendentes)
+    status: Optional[bool] = None
+    # Só tarefas criadas a partir desta data (inclusive)
+    created_after: Optional[datetime] = None
+    # Só tarefas criadas antes desta data
+    created_before: Optional[datetime] = None
+    # Campo de ordenação, ex.: "-created_at" para as mais recentes primeiro
+    sort: Optional[TodoSort] = None
+
+    # As datas são gravadas sem fuso (datetime.utcnow()); datas com fuso viram UTC sem fuso,
+    # para que a comparação seja a mesma no MongoDB e no backend em memória
+    @field_validator("created_after", "created_before")
+    @classmethod
+    def naive_utc(cls, value: Optional[datetime]) -> Optional[datetime]:
+        if value is not None and value.tzinfo is not None:
+            return value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+
+    @property
+    def sort_field(self) -> Optional[str]:
+        return self.sort.lstrip("-") if self.sort else None
+
+    @property
+    def descending(self) -> bool:
+        return bool(self.sort) and self.sort.startswith("-")
+
+    @property
+    def created_range(self) -> bool:
+        return self.created_after is not None or self.created_before is not None
@@ -26,6 +26,12 @@ class UserDetail(BaseModel):
     disabled: Optional[bool] = False
 
 
+# Resposta de GET /users/available: True se livre, False se já usado, None se não foi consultado
+class UserAvailability(BaseModel):
+    username: Optional[bool] = None
+    email: Optional[bool] = None
+
+
 # ORM = Object-Relational Mapping
 # ODM = Object-Document Mapping (usado em bancos NoSQL como MongoDB)
 class UserOut(BaseModel):
@@ -0,0 +1,233 @@
+import asyncio
+import hashlib
+import logging
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, Optional, Set, Tuple, Union
+
+from pymongo.errors import DuplicateKeyError
+
+from core.config import settings
+from models.idempotency_model import IdempotencyRecord
+from models.user_model import User
+from repositories import idempotency_repository
+
+
+logger = logging.getLogger(__name__)
+
+# Escritas com o cabeçalho Idempotency-Key.
+#
+# Clientes (principalmente mobile) repetem a requisição quando dá timeout. Com a chave,
+# a primeira execução guarda a resposta no MongoDB (com TTL) e as repetições recebem a
+# mesma resposta sem executar o TodoService de novo.
+# - Cache em memória (LRU) na frente do MongoDB para as repetições mais recentes.
+# - Requisições simultâneas com a mesma chave esperam a primeira terminar (future por chave)
+#   em vez de executar a escrita em paralelo. Isso vale dentro de um processo; entre
+#   processos, o índice único do MongoDB garante que só uma resposta fica guardada.
+
+# Status, corpo e media type de uma resposta
+StoredResponse = Tuple[int, bytes, Optional[str]]
+
+_cache: "OrderedDict[str, IdempotencyRecord]" = OrderedDict()
+_in_flight: Dict[str, asyncio.Future] = {}
+# Tarefas de run e complete_soon em andamento (referência forte até terminarem)
+_background: Set[asyncio.Task] = set()
+
+
+class IdempotencyConflict(Exception):
+    """A chave já foi usada com outro método, rota ou corpo."""
+
+
+class IdempotencyInProgress(Exception):
+    """A requisição original com a mesma chave não terminou dentro de settings.IDEMPOTENCY_WAIT_TIMEOUT."""
+
+
+def fingerprint(*parts: Union[str, bytes]) -> str:
+    """
+    Hash que identifica a requisição original (método, rota, corpo...).
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8") if isinstance(part, str) else part)
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _scoped(user: User, key: str) -> str:
+    # Chaves de usuários diferentes nunca colidem
+    return f"{user.user_id}:{key}"
+
+
+def _cache_get(scoped: str) -> Optional[IdempotencyRecord]:
+    record = _cache.get(scoped)
+    if record is None:
+        return None
+    if record.created_at < datetime.utcnow() - timedelta(seconds=settings.IDEMPOTENCY_TTL_SECONDS):
+        del _cache[scoped]
+        return None
+    _cache.move_to_end(scoped)
+    return record
+
+
+def _cache_put(record: IdempotencyRecord) -> None:
+    _cache[record.key] = record
+    _cache.move_to_end(record.key)
+    while len(_cache) > settings.IDEMPOTENCY_CACHE_SIZE:
+        _cache.popitem(last=False)
+
+
+def _release(scoped: str) -> None:
+    # Acorda as requisições que esperavam por esta chave
+    pending = _in_flight.pop(scoped, None)
+    if pending is not None and not pending.done():
+        pending.set_result(None)
+
+
+def _checked(record: IdempotencyRecord, request_fingerprint: str) -> IdempotencyRecord:
+    if record.fingerprint != request_fingerprint:
+        raise IdempotencyConflict()
+    return record
+
+
+async def _lookup(scoped: str) -> Optional[IdempotencyRecord]:
+    record = _cache_get(scoped)
+    if record is None:
+        record = await idempotency_repository.get(scoped)
+        if record is not None:
+            _cache_put(record)
+    return record
+
+
+class IdempotencyService:
+    @staticmethod
+    async def lookup(user: User, key: str, request_fingerprint: str) -> Optional[IdempotencyRecord]:
+        """
+        Resposta guardada para a chave, ou None. Não espera nem assume a chave.
+        """
+        record = await _lookup(_scoped(user, key))
+        return _checked(record, request_fingerprint) if record is not None else None
+
+    @staticmethod
+    async def begin(user: User, key: str, request_fingerprint: str) -> Optional[IdempotencyRecord]:
+        """
+        Procura a resposta guardada para a chave.
+
+        Retorna a resposta guardada (a requisição é uma repetição) ou None: nesse caso a
+        requisição atual passa a ser a dona da chave e deve chamar `complete` ou `abandon`.
+        Se outra requisição com a mesma chave está em andamento, espera ela terminar.
+        """
+        scoped = _scoped(user, key)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.IDEMPOTENCY_WAIT_TIMEOUT
+        while True:
+            pending = _in_flight.get(scoped)
+            if pending is not None:
+                try:
+                    await asyncio.wait_for(asyncio.shield(pending), max(deadline - loop.time(), 0))
+                except asyncio.TimeoutError:
+                    raise IdempotencyInProgress()
+                # A original terminou (ou desistiu): procura de novo
+                continue
+
+            record = await _lookup(scoped)
+            if record is not None:
+                return _checked(record, request_fingerprint)
+
+            # Outra requisição pode ter assumido ou concluído a chave durante a consulta
+            if scoped in _in_flight or scoped in _cache:
+                continue
+            _in_flight[scoped] = loop.create_future()
+            return None
+
+    @staticmethod
+    async def complete(
+        user: User,
+        key: str,
+        request_fingerprint: str,
+        response: StoredResponse,
+    ) -> IdempotencyRecord:
+        """
+        Guarda a resposta da requisição dona da chave e libera quem estava esperando.
+        """
+        scoped = _scoped(user, key)
+        status_code, body, media_type = response
+        data = {
+            "key": scoped,
+            "fingerprint": request_fingerprint,
+            "status_code": status_code,
+            "body": body,
+            "media_type": media_type,
+        }
+        try:
+            try:
+                record = await idempotency_repository.save(data)
+            except DuplicateKeyError:
+                # Outro processo guardou primeiro; a escrita já foi feita, responde normalmente
+                record = IdempotencyRecord.model_construct(created_at=datetime.utcnow(), **data)
+            except Exception:
+                logger.exception("Falha ao guardar a resposta idempotente %s", scoped)
+                record = IdempotencyRecord.model_construct(created_at=datetime.utcnow(), **data)
+            _cache_put(record)
+        finally:
+            _release(scoped)
+        return record
+
+    @staticmethod
+    def complete_soon(
+        user: User,
+        key: str,
+        request_fingerprint: str,
+        response: StoredResponse,
+    ) -> None:
+        """
+        Como `complete`, mas em uma tarefa separada. Usado no fim de respostas em stream,
+        quando a requisição pode já ter sido cancelada (cliente desconectou).
+        """
+        task = asyncio.get_running_loop().create_task(
+            IdempotencyService.complete(user, key, request_fingerprint, response)
+        )
+        _background.add(task)
+        task.add_done_callback(_background.discard)
+
+    @staticmethod
+    def abandon(user: User, key: str) -> None:
+        """
+        Desiste da chave (a escrita falhou): a próxima requisição com ela executa de novo.
+        """
+        _release(_scoped(user, key))
+
+    @staticmethod
+    async def run(
+        user: User,
+        key: str,
+        request_fingerprint: str,
+        operation: Callable[[], Awaitable[StoredResponse]],
+    ) -> Tuple[IdempotencyRecord, bool]:
+        """
+        Executa `operation` uma única vez por chave.
+
+        Retorna a resposta (guardada ou recém-criada) e se ela é uma repetição.
+        Erros de `operation` (ex.: HTTPException 404) não são guardados.
+
+        Depois que `operation` começa, a chave não é mais liberada por cancelamento
+        (cliente desconectou): a escrita pode já ter sido feita. `operation` e a gravação
+        da resposta continuam em uma tarefa separada e a repetição recebe a resposta.
+        """
+        record = await IdempotencyService.begin(user, key, request_fingerprint)
+        if record is not None:
+            return record, True
+
+        async def execute() -> IdempotencyRecord:
+            try:
+                response = await operation()
+            except Exception:
+                IdempotencyService.abandon(user, key)
+                raise
+            return await IdempotencyService.complete(user, key, request_fingerprint, response)
+
+        task = asyncio.get_running_loop().create_task(execute())
+        _background.add(task)
+        task.add_done_callback(_background.discard)
+        # shield: cancelar a requisição não cancela a escrita nem a gravação da resposta
+        return await asyncio.shield(task), False
+
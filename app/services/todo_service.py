@@ -1,25 +1,69 @@
 from models.user_model import User
-from models.todo_model import Todo
-from typing import List, Optional
-from schemas.todo_schema import TodoCreate, TodoUpdate
+from core.profiling import profiled
+from models.todo_model import Todo, list_query_index
+import csv
+import io
+import json
+from itertools import islice
+from typing import Any, AsyncIterator, BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple
+from pydantic import ValidationError
+from starlette.concurrency import run_in_threadpool
+from core.config import settings
+from repositories import todo_repository
+from schemas.todo_schema import TodoCreate, TodoUpdate, TodoListQuery
 from uuid import UUID
 
 
+# Formatos aceitos no import em lote
+IMPORT_FORMATS = ("ndjson", "csv")
+
+
+def _import_rows(file: BinaryIO, file_format: str) -> Iterator[Tuple[int, Any]]:
+    """
+    Lê o arquivo linha a linha, sem carregá-lo inteiro na memória.
+
+    Gera (número da linha, dados) em que `dados` é um dict, ou uma exceção
+    quando a linha não pôde ser interpretada.
+    """
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    if file_format == "csv":
+        reader = csv.DictReader(text)
+        for row in reader:
+            # Células vazias viram None (ex.: descrição em branco)
+            yield reader.line_num, {key: (value or None) for key, value in row.items() if key}
+        return
+    for line_number, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except json.JSONDecodeError as e:
+            yield line_number, e
+
+
 class TodoService:
 
 
     @staticmethod
-    async def list_todos(user: User) -> List[Todo]:
+    @profiled("service")
+    async def list_todos(user: User, query: Optional[TodoListQuery] = None) -> List[Todo]:
         """
-        Lista todas as tarefas (todos) de um usuário específico.
+        Lista as tarefas (todos) de um usuário específico.
 
         :param user: Instância do usuário autenticado.
+        :param query: Filtros (status, intervalo de created_at) e ordenação opcionais.
         :return: Lista de instâncias de Todo pertencentes ao usuário.
+        :raises ValueError: Se a combinação de filtros e ordenação não tiver índice (ver LIST_QUERY_INDEXES).
         """
-        todos = await Todo.find(Todo.owner.id == user.id).to_list()
+        query = query or TodoListQuery()
+        # Só aceitamos combinações atendidas por um índice declarado em Todo
+        index = list_query_index(query.status, query.created_range, query.sort_field)
+        # Listagens toleram um pequeno atraso: perfil "relaxed" (pode ler de secundários)
+        todos = await todo_repository.list_by_owner(user, query, read="relaxed", index=index)
         return todos
     
     @staticmethod
+    @profiled("service")
     async def create_todo(user: User, data: TodoCreate) -> Todo:
         """
         Cria uma nova tarefa (todo) para um usuário específico.
@@ -28,20 +72,12 @@ class TodoService:
         :param data: Dados para criar a nova tarefa (título, descrição, etc).
         :return: A instância de Todo recém-criada.
             """
-        # Cria uma nova instância de Todo usando os dados fornecidos (data) e define o proprietário (owner) como o usuário atual.
-        # O método model_dump() converte o objeto 'data' (Pydantic model) em um dicionário, 
-        # permitindo a expansão dos campos como argumentos nomeados (**kwargs) para o construtor de Todo.
-        # Em java, seria algo como new Todo(data.getTitle(), data.getDescription(), user)
-        # Porém, em Python, usamos o unpacking com **data.model_dump() para passar todos os campos de uma vez.
-        # Os dois ** servem para "desempacotar" o dicionário retornado por data.model_dump() 
-        # e passar seus pares chave-valor como argumentos nomeados para o construtor de Todo.
-        todo = Todo(**data.model_dump(), owner=user)
-
-        # Insere o novo objeto Todo no banco de dados de forma assíncrona.
-        # O método insert() salva o documento na coleção correspondente e retorna a própria instância já persistida.
-        return await todo.insert()
+        # O método model_dump() converte o objeto 'data' (Pydantic model) em um dicionário,
+        # e o repositório cria a tarefa com esses campos e o usuário atual como dono (owner_id).
+        return await todo_repository.create(user, data.model_dump())
     
     @staticmethod
+    @profiled("service")
     async def detail(user: User, todo_id: UUID) -> Optional[Todo]:
         """
         Recupera uma tarefa (todo) pelo seu ID e pelo usuário dono.
@@ -57,13 +93,38 @@ class TodoService:
             Garante que o usuário só possa acessar tarefas que lhe pertencem.
         """
         # Busca a tarefa pelo ID e pelo dono
-        todo = await Todo.find_one(
-            Todo.todo_id == todo_id,
-            Todo.owner.id == user.id
-        )
+        todo = await todo_repository.get(user, todo_id)
         return todo
+
+    @staticmethod
+    @profiled("service")
+    async def detail_many(user: User, todo_ids: List[UUID]) -> Tuple[List[Todo], List[UUID]]:
+        """
+        Recupera várias tarefas (todos) do usuário em uma única consulta.
+
+        Parâmetros:
+            user (User): O usuário solicitante.
+            todo_ids (List[UUID]): IDs das tarefas, na ordem desejada.
+
+        Retorna:
+            Tuple[List[Todo], List[UUID]]: As tarefas encontradas (na ordem pedida)
+            e os IDs que não foram encontrados.
+
+        Observação:
+            Usa a mesma regra de propriedade de `detail`: tarefas de outros usuários
+            aparecem como não encontradas.
+        """
+        # Remove IDs repetidos mantendo a ordem original
+        ids = list(dict.fromkeys(todo_ids))
+        # Uma única consulta com $in, filtrada pelo dono
+        todos = await todo_repository.get_many(user, ids)
+        por_id = {todo.todo_id: todo for todo in todos}
+        found = [por_id[todo_id] for todo_id in ids if todo_id in por_id]
+        missing = [todo_id for todo_id in ids if todo_id not in por_id]
+        return found, missing
     
     @staticmethod
+    @profiled("service")
     async def update(user: User, todo_id: UUID, data: TodoUpdate):
         """
         Atualiza uma tarefa (todo) existente de um usuário.
@@ -85,16 +146,14 @@ class TodoService:
         todo = await TodoService.detail(user, todo_id)
         if not todo:
             return None
-        # Atualiza os campos informados
-        await todo.update({
-            "$set": data.model_dump(exclude_unset=True)
-        })
-        # Salva as alterações no banco
-        await todo.save()
-        # Retorna a tarefa atualizada
-        return todo
+        changes = data.model_dump(exclude_unset=True)
+        # Alternar só o status é frequente e barato de refazer: perfil "fast" (w=1)
+        profile = "fast" if set(changes) == {"status"} else None
+        # Atualiza os campos informados e retorna a tarefa atualizada
+        return await todo_repository.update(todo, changes, write=profile)
 
     @staticmethod
+    @profiled("service")
     async def delete(user: User, todo_id: UUID) -> bool:
         """
         Exclui uma tarefa (todo) existente de um usuário.
@@ -115,7 +174,88 @@ class TodoService:
         if not todo:
             return False
         # Exclui a tarefa do banco de dados
-        await todo.delete()
+        await todo_repository.delete(todo)
         return True
 
-        
\ No newline at end of file
+        
+    @staticmethod
+    async def import_todos(
+        user: User,
+        file: BinaryIO,
+        file_format: str,
+        on_write: Optional[Callable[[], None]] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Importa tarefas de um arquivo NDJSON ou CSV, em lotes.
+
+        Parâmetros:
+            user (User): Usuário dono das tarefas importadas.
+            file (BinaryIO): Arquivo enviado (lido em sequência, nunca inteiro na memória).
+            file_format (str): "ndjson" ou "csv".
+            on_write (Callable, opcional): Chamado antes de cada insert_many. Mesmo se a
+                requisição for cancelada durante o insert, o lote pode ter sido gravado.
+
+        Retorna:
+            Um gerador assíncrono de eventos de progresso, um por lote, e um evento final:
+            {"event": "progress" | "done", "processed", "inserted", "failed", "errors"}.
+            `errors` traz os erros das linhas daquele lote (até settings.TODO_IMPORT_MAX_ERRORS no total).
+
+        Fluxo:
+            1. Lê até settings.TODO_IMPORT_BATCH_SIZE linhas (em uma thread, para não bloquear o event loop).
+            2. Valida cada linha com o schema TodoCreate.
+            3. Insere as válidas com um único insert_many sem ordem (ordered=False).
+        """
+        rows = _import_rows(file, file_format)
+        batch_size = settings.TODO_IMPORT_BATCH_SIZE
+        processed = inserted = failed = reported = 0
+
+        def report(line_number: int, messages: List[str]) -> Optional[Dict[str, Any]]:
+            nonlocal reported
+            if reported >= settings.TODO_IMPORT_MAX_ERRORS:
+                return None
+            reported += 1
+            return {"row": line_number, "errors": messages}
+
+        while True:
+            try:
+                batch = await run_in_threadpool(lambda: list(islice(rows, batch_size)))
+            except (UnicodeDecodeError, csv.Error) as e:
+                # Arquivo corrompido: não dá para continuar lendo, encerra com o que já foi importado
+                yield {"event": "error", "processed": processed, "inserted": inserted,
+                       "failed": failed, "errors": [{"row": processed + 1, "errors": [str(e)]}]}
+                return
+            if not batch:
+                break
+
+            errors = []
+            valid: List[dict] = []
+            valid_lines: List[int] = []
+            for line_number, data in batch:
+                try:
+                    if isinstance(data, Exception):
+                        raise ValueError(f"Linha inválida: {data}")
+                    valid.append(TodoCreate.model_validate(data).model_dump())
+                    valid_lines.append(line_number)
+                except ValidationError as e:
+                    errors.append((line_number, [f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors()]))
+                except ValueError as e:
+                    errors.append((line_number, [str(e)]))
+
+            if valid:
+                if on_write is not None:
+                    on_write()
+                count, insert_errors = await todo_repository.create_many(user, valid)
+                inserted += count
+                errors.extend((valid_lines[index], [message]) for index, message in insert_errors)
+
+            processed += len(batch)
+            failed += len(errors)
+            yield {
+                "event": "progress",
+                "processed": processed,
+                "inserted": inserted,
+                "failed": failed,
+                "errors": [item for item in (report(line, messages) for line, messages in errors) if item],
+            }
+
+        yield {"event": "done", "processed": processed, "inserted": inserted, "failed": failed, "errors": []}
@@ -1,8 +1,16 @@
 from schemas.user_schema import UserAuth
 from models.user_model import User
+from core.profiling import profiled
 from core.security import get_password, verify_password
-from typing import Optional
+from repositories import user_repository
+from core.bloom import BloomFilter
+from core.config import settings
+from pymongo.errors import DuplicateKeyError
+from typing import Dict, Optional
 from uuid import UUID
+from datetime import datetime, timedelta
+from time import monotonic
+import asyncio
 
 
 
@@ -11,31 +19,139 @@ from uuid import UUID
 # Os services em geral contêm a lógica de negócio da aplicação.
 
 
+# Filtros de Bloom com os usernames e emails já cadastrados (carregados no startup).
+# Respondem "com certeza livre" sem ir ao banco; um "talvez ocupado" é confirmado no MongoDB.
+# São locais a cada processo: com vários workers, um usuário criado em outro processo só
+# entra no filtro na próxima sincronização, por isso um "livre" só é respondido por um
+# filtro sincronizado há no máximo settings.BLOOM_SYNC_INTERVAL segundos.
+# O índice único do MongoDB continua sendo a palavra final.
+class _IdentityFilters:
+
+    def __init__(self) -> None:
+        self.usernames = BloomFilter(settings.BLOOM_EXPECTED_USERS, settings.BLOOM_ERROR_RATE)
+        self.emails = BloomFilter(settings.BLOOM_EXPECTED_USERS, settings.BLOOM_ERROR_RATE)
+        # Início (UTC) e instante (monotonic) da última sincronização; None antes da carga
+        self.synced_at: Optional[datetime] = None
+        self.synced_monotonic = 0.0
+        self._lock = asyncio.Lock()
+
+    def add(self, username: str, email: str) -> None:
+        self.usernames.add(username)
+        self.emails.add(email)
+
+    def stale(self) -> bool:
+        return self.synced_at is None or monotonic() - self.synced_monotonic >= settings.BLOOM_SYNC_INTERVAL
+
+    async def sync(self, full: bool = False) -> int:
+        """
+        Adiciona os usuários criados desde a última sincronização (ou todos, com `full`).
+        Chamadas simultâneas esperam a sincronização em andamento em vez de repetir a consulta.
+        """
+        stale_since = self.synced_monotonic
+        async with self._lock:
+            if not full and self.synced_monotonic != stale_since and not self.stale():
+                return 0
+            started, started_monotonic = datetime.utcnow(), monotonic()
+            since = None
+            if not full and self.synced_at is not None:
+                since = self.synced_at - timedelta(seconds=settings.BLOOM_SYNC_OVERLAP)
+            total = 0
+            async for username, email in user_repository.iter_identities(since):
+                self.add(username, email)
+                total += 1
+            self.synced_at, self.synced_monotonic = started, started_monotonic
+            return total
+
+    async def might_contain(self, bloom: BloomFilter, value: str) -> bool:
+        if value in bloom:
+            return True
+        if not self.stale():
+            return False
+        # "Livre" de um filtro desatualizado: confere os usuários criados desde a última sincronização
+        await self.sync()
+        return value in bloom
+
+
+_filters = _IdentityFilters()
+
+
 class UserService:
     @staticmethod
+    async def load_availability_filters() -> int:
+        """
+        Preenche os filtros de Bloom com os usuários existentes.
+        Chamado uma vez no startup da aplicação; retorna a quantidade de usuários lidos.
+        """
+        return await _filters.sync(full=True)
+
+    @staticmethod
+    @profiled("service")
+    async def username_taken(username: str) -> bool:
+        # Fora do filtro (sincronizado): com certeza livre, sem consultar o usuário no banco
+        if not await _filters.might_contain(_filters.usernames, username):
+            return False
+        return await user_repository.get_by_username(username) is not None
+
+    @staticmethod
+    @profiled("service")
+    async def email_taken(email: str) -> bool:
+        if not await _filters.might_contain(_filters.emails, email):
+            return False
+        return await user_repository.get_by_email(email) is not None
+
+    @staticmethod
+    @profiled("service")
+    async def check_availability(
+        username: Optional[str] = None,
+        email: Optional[str] = None
+    ) -> Dict[str, Optional[bool]]:
+        """
+        Verifica se o username e/ou o email ainda podem ser usados.
+
+        Retorno:
+        - {"username": bool | None, "email": bool | None}; None quando o campo não foi informado.
+        """
+        return {
+            "username": None if username is None else not await UserService.username_taken(username),
+            "email": None if email is None else not await UserService.email_taken(email),
+        }
+
+    @staticmethod
+    @profiled("service")
     async def create_user(user: UserAuth):
-        usuario = User(
-            username=user.username,
-            email=user.email,
-            hash_password=get_password(user.password),
-            first_name=user.first_name,
-            last_name=user.last_name,
-            disabled=user.disabled
+        # Rejeita colisões óbvias antes do bcrypt, que é a parte cara da criação
+        if await UserService.username_taken(user.username) or await UserService.email_taken(user.email):
+            raise DuplicateKeyError("Username or email already exists.")
+
+        # A criação de usuário precisa sobreviver a um failover: perfil "durable" (w="majority")
+        usuario = await user_repository.create(
+            {
+                "username": user.username,
+                "email": user.email,
+                "hash_password": get_password(user.password),
+                "first_name": user.first_name,
+                "last_name": user.last_name,
+                "disabled": user.disabled,
+            },
+            write="durable"
         )
-        await usuario.save()
+        _filters.add(usuario.username, usuario.email)
         return usuario
 
     # A função abaixo pega um usuário pelo email
     @staticmethod
+    @profiled("service")
     async def get_user_by_email(email: str) -> Optional[User]:
         # Sua assinatura recebe um email (string) e retorna um usuário (User) ou None
-        return await User.find_one(User.email == email)
+        return await user_repository.get_by_email(email)
     
     @staticmethod
+    @profiled("service")
     async def get_user_by_id(id: UUID) -> Optional[User]:
-        return await User.find_one(User.user_id == id)
+        return await user_repository.get_by_id(id)
     
     @staticmethod
+    @profiled("service")
     async def authenticate(email: str, password: str) -> Optional[User]:
         """
         Autentica um usuário com base no e-mail e na senha fornecidos.
@@ -0,0 +1,50 @@
+import importlib.util
+import os
+import sys
+from uuid import uuid4
+
+import pytest
+
+# Os módulos da aplicação são importados a partir de app/ (como em `uvicorn app:app`)
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+# core.config exige estas variáveis; nos testes qualquer valor serve
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret")
+os.environ.setdefault("JWT_REFRESH_SECRET_KEY", "test-refresh-secret")
+os.environ.setdefault("MONGO_CONNECTION_STRING", "mongodb://localhost:27017")
+# A API é testada com os repositórios em memória; os testes que precisam do MongoDB
+# (ex.: test_list_query_indexes.py) conectam por conta própria
+os.environ.setdefault("REPOSITORY_BACKEND", "memory")
+
+
+def _fastapi_app():
+    # Carregado pelo caminho: o pytest pode importar app/ como pacote, que tem o mesmo nome de app.py
+    spec = importlib.util.spec_from_file_location("todo_app_main", os.path.join(APP_DIR, "app.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.app
+
+
+@pytest.fixture(scope="session")
+def fastapi_app():
+    return _fastapi_app()
+
+
+@pytest.fixture
+def client(fastapi_app):
+    from fastapi.testclient import TestClient
+
+    with TestClient(fastapi_app) as client:
+        yield client
+
+
+@pytest.fixture
+def auth_headers(client):
+    # Um usuário novo por teste: os repositórios em memória são compartilhados no processo
+    name = f"user{uuid4().hex[:12]}"
+    email = f"{name}@example.com"
+    response = client.post("/api/v1/users/create", json={"email": email, "username": name, "password": "12345"})
+    assert response.status_code == 200, response.text
+    token = client.post("/api/v1/auth/login", data={"username": email, "password": "12345"}).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
@@ -0,0 +1,128 @@
+import asyncio
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from repositories import idempotency_repository
+from services.idempotency_service import IdempotencyService
+
+
+# Idempotency-Key nas escritas de tarefas, com os repositórios em memória (ver conftest.py).
+
+
+def _key() -> str:
+    return uuid4().hex
+
+
+def _user() -> SimpleNamespace:
+    # O serviço só usa o user_id para separar as chaves por usuário
+    return SimpleNamespace(user_id=uuid4())
+
+
+def test_create_is_replayed(client, auth_headers):
+    headers = {**auth_headers, "Idempotency-Key": _key()}
+    first = client.post("/api/v1/todo/create", json={"title": "uma vez"}, headers=headers)
+    second = client.post("/api/v1/todo/create", json={"title": "uma vez"}, headers=headers)
+
+    assert first.status_code == second.status_code == 201
+    assert "Idempotent-Replayed" not in first.headers
+    assert second.headers["Idempotent-Replayed"] == "true"
+    assert second.json() == first.json()
+    assert len(client.get("/api/v1/todo/", headers=auth_headers).json()) == 1
+
+
+def test_changed_payload_is_rejected(client, auth_headers):
+    headers = {**auth_headers, "Idempotency-Key": _key()}
+    assert client.post("/api/v1/todo/create", json={"title": "original"}, headers=headers).status_code == 201
+
+    response = client.post("/api/v1/todo/create", json={"title": "outro corpo"}, headers=headers)
+
+    assert response.status_code == 422
+    assert len(client.get("/api/v1/todo/", headers=auth_headers).json()) == 1
+
+
+def test_concurrent_duplicates_run_once():
+    user, key, calls = _user(), _key(), []
+
+    async def operation():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return 201, b'{"ok":true}', "application/json"
+
+    async def main():
+        return await asyncio.gather(*(IdempotencyService.run(user, key, "fp", operation) for _ in range(5)))
+
+    results = asyncio.run(main())
+
+    assert len(calls) == 1
+    assert sorted(replayed for _, replayed in results) == [False, True, True, True, True]
+    assert {record.body for record, _ in results} == {b'{"ok":true}'}
+
+
+def test_errors_are_not_stored():
+    user, key = _user(), _key()
+
+    async def failing():
+        raise ValueError("falhou antes de escrever")
+
+    async def succeeding():
+        return 200, b"ok", None
+
+    async def main():
+        with pytest.raises(ValueError):
+            await IdempotencyService.run(user, key, "fp", failing)
+        return await IdempotencyService.run(user, key, "fp", succeeding)
+
+    record, replayed = asyncio.run(main())
+    assert (record.body, replayed) == (b"ok", False)
+
+
+def test_cancelled_request_keeps_the_write():
+    user, key, calls = _user(), _key(), []
+
+    async def operation():
+        calls.append(1)
+        await asyncio.sleep(0.05)  # a escrita já começou quando o cliente desconecta
+        return 201, b"criada", "application/json"
+
+    async def main():
+        request = asyncio.ensure_future(IdempotencyService.run(user, key, "fp", operation))
+        await asyncio.sleep(0.01)
+        request.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await request
+        # A repetição espera a escrita original e recebe a resposta dela
+        return await IdempotencyService.run(user, key, "fp", operation)
+
+    record, replayed = asyncio.run(main())
+    assert len(calls) == 1
+    assert (record.body, replayed) == (b"criada", True)
+
+
+def test_cancelled_request_keeps_the_stored_response(monkeypatch):
+    user, key, calls = _user(), _key(), []
+    save = idempotency_repository.save
+
+    async def slow_save(data):
+        await asyncio.sleep(0.05)
+        return await save(data)
+
+    monkeypatch.setattr(idempotency_repository, "save", slow_save)
+
+    async def operation():
+        calls.append(1)
+        return 201, b"criada", "application/json"
+
+    async def main():
+        request = asyncio.ensure_future(IdempotencyService.run(user, key, "fp", operation))
+        await asyncio.sleep(0.01)  # cancelada enquanto a resposta é gravada
+        request.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await request
+        await asyncio.sleep(0.1)
+        return await IdempotencyService.lookup(user, key, "fp")
+
+    record = asyncio.run(main())
+    assert len(calls) == 1
+    assert record is not None and record.body == b"criada"
@@ -0,0 +1,65 @@
+from datetime import datetime
+
+import pytest
+
+from models.todo_model import LIST_QUERY_INDEXES, Todo, legacy_index, list_query_index
+from schemas.todo_schema import TodoListQuery
+
+
+# Escolha do índice da listagem e validação dos filtros, sem MongoDB
+# (a API roda com os repositórios em memória, ver conftest.py).
+
+DECLARED_INDEXES = {index.document["name"] for index in Todo.Settings.indexes}
+
+UNSUPPORTED = [
+    (None, True, "update_at"),
+    (True, True, "update_at"),
+    (None, True, "title"),
+    (False, True, "title"),
+]
+
+
+@pytest.mark.parametrize("combination, index", sorted(LIST_QUERY_INDEXES.items(), key=str))
+def test_list_query_index_is_declared(combination, index):
+    has_status, created_range, sort_field = combination
+    assert list_query_index(True if has_status else None, created_range, sort_field) == index
+    # Os dois ramos da consulta de compatibilidade precisam de índice
+    assert index in DECLARED_INDEXES
+    assert legacy_index(index) in DECLARED_INDEXES
+
+
+@pytest.mark.parametrize("status, created_range, sort_field", UNSUPPORTED)
+def test_list_query_index_rejects_unsupported(status, created_range, sort_field):
+    with pytest.raises(ValueError):
+        list_query_index(status, created_range, sort_field)
+
+
+@pytest.mark.parametrize("params", [
+    "created_after=2025-01-01T00:00:00&sort=title",
+    "created_before=2025-01-01T00:00:00&sort=-update_at",
+    "status=true&created_after=2025-01-01T00:00:00&sort=update_at",
+])
+def test_list_rejects_unsupported_combination(client, auth_headers, params):
+    response = client.get(f"/api/v1/todo/?{params}", headers=auth_headers)
+    assert response.status_code == 400
+    assert "Combinação não suportada" in response.json()["detail"]
+
+
+def test_list_query_dates_become_naive_utc():
+    query = TodoListQuery(created_after="2025-01-01T03:00:00+03:00", created_before="2025-01-02T00:00:00Z")
+    assert query.created_after == datetime(2025, 1, 1)
+    assert query.created_before == datetime(2025, 1, 2)
+    assert TodoListQuery(created_after="2025-01-01T00:00:00").created_after == datetime(2025, 1, 1)
+
+
+def test_list_filters_by_aware_dates(client, auth_headers):
+    for title in ("primeira", "segunda"):
+        assert client.post("/api/v1/todo/create", json={"title": title}, headers=auth_headers).status_code == 201
+
+    response = client.get("/api/v1/todo/?created_after=2020-01-01T00:00:00Z&sort=created_at", headers=auth_headers)
+    assert response.status_code == 200
+    assert [todo["title"] for todo in response.json()] == ["primeira", "segunda"]
+
+    response = client.get("/api/v1/todo/?created_before=2020-01-01T00:00:00%2B03:00", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json() == []
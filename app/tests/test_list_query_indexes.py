@@ -0,0 +1,140 @@
+import asyncio
+import os
+import random
+from datetime import datetime, timedelta
+
+import pytest
+from beanie import init_beanie
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import MongoClient
+from pymongo.errors import PyMongoError
+
+from core.config import settings
+from core.query_log import _find_key
+from models.todo_model import LIST_QUERY_INDEXES, Todo, legacy_index
+from models.user_model import User
+from repositories.beanie_repository import list_filter, list_sort
+from schemas.todo_schema import TodoListQuery
+
+
+# Prova, com explain() em um MongoDB real, que cada combinação aceita na listagem
+# (LIST_QUERY_INDEXES) é atendida pelo índice declarado, sem ordenação em memória (SORT)
+# nem varredura da coleção (COLLSCAN). Sem MongoDB disponível, os testes são pulados,
+# a não ser com MONGO_TEST_REQUIRED=1 (como no CI, em .github/workflows/tests.yml).
+#
+#     MONGO_TEST_URL=mongodb://localhost:27017 python -m pytest tests
+
+MONGO_TEST_URL = os.environ.get("MONGO_TEST_URL", "mongodb://localhost:27017")
+MONGO_TEST_REQUIRED = os.environ.get("MONGO_TEST_REQUIRED", "") not in ("", "0")
+DATABASE = "todoapp_test_list_indexes"
+
+
+def _mongo_available() -> bool:
+    try:
+        MongoClient(MONGO_TEST_URL, serverSelectionTimeoutMS=1000).admin.command("ping")
+        return True
+    except PyMongoError:
+        return False
+
+
+pytestmark = pytest.mark.skipif(
+    not MONGO_TEST_REQUIRED and not _mongo_available(), reason=f"MongoDB indisponível em {MONGO_TEST_URL}"
+)
+
+
+async def _init() -> AsyncIOMotorClient:
+    client = AsyncIOMotorClient(MONGO_TEST_URL)
+    await init_beanie(database=client[DATABASE], document_models=[User, Todo])
+    return client
+
+
+async def _seed() -> User:
+    await _init()
+    await Todo.get_motor_collection().delete_many({})
+    await User.get_motor_collection().delete_many({})
+
+    rng = random.Random(35)
+    start = datetime(2025, 1, 1)
+    owners = [
+        await User(username=f"user{i}", email=f"user{i}@example.com", hash_password="x").insert()
+        for i in range(4)
+    ]
+    todos = []
+    for owner in owners:
+        for i in range(300):
+            data = {
+                "title": f"tarefa {rng.randrange(10_000):05d}",
+                "status": rng.random() < 0.3,
+                "created_at": start + timedelta(minutes=rng.randrange(500_000)),
+                "update_at": start + timedelta(minutes=rng.randrange(500_000)),
+            }
+            # Metade no formato antigo (só o DBRef), como antes da migração do owner_id
+            if i % 2:
+                todos.append(Todo(**data, owner_id=owner.user_id))
+            else:
+                todos.append(Todo(**data, owner=owner))
+    await Todo.insert_many(todos)
+    return owners[0]
+
+
+@pytest.fixture(scope="module")
+def owner():
+    user = asyncio.run(_seed())
+    yield user
+    MongoClient(MONGO_TEST_URL).drop_database(DATABASE)
+
+
+def _query(status: bool, created_range: bool, sort_field) -> TodoListQuery:
+    return TodoListQuery(
+        status=True if status else None,
+        created_after=datetime(2025, 3, 1) if created_range else None,
+        created_before=datetime(2025, 6, 1) if created_range else None,
+        sort=f"-{sort_field}" if sort_field else None,
+    )
+
+
+def _plan(node) -> tuple:
+    # Estágios e índices usados pelo plano vencedor
+    stages, indexes = [], set()
+    if isinstance(node, dict):
+        if "stage" in node:
+            stages.append(node["stage"])
+            if node["stage"] == "IXSCAN":
+                indexes.add(node["indexName"])
+        for value in node.values():
+            child_stages, child_indexes = _plan(value)
+            stages.extend(child_stages)
+            indexes |= child_indexes
+    elif isinstance(node, list):
+        for value in node:
+            child_stages, child_indexes = _plan(value)
+            stages.extend(child_stages)
+            indexes |= child_indexes
+    return stages, indexes
+
+
+async def _explain(user: User, query: TodoListQuery, index: str) -> dict:
+    await _init()
+    # Mesmo filtro, ordenação e hint que BeanieTodoRepository.list_by_owner
+    filter_query = Todo.find(*list_filter(user, query)).get_filter_query()
+    hint = None if settings.TODO_OWNER_COMPAT_READS else index
+    cursor = Todo.get_motor_collection().find(filter_query, sort=list_sort(query), hint=hint)
+    return _find_key(await cursor.explain(), "winningPlan")
+
+
+@pytest.mark.parametrize("compat_reads", [True, False], ids=["compat", "owner_id"])
+@pytest.mark.parametrize(
+    "combination",
+    sorted(LIST_QUERY_INDEXES, key=str),
+    ids=lambda c: f"status={c[0]}-range={c[1]}-sort={c[2]}",
+)
+def test_list_query_uses_declared_index(owner, monkeypatch, combination, compat_reads):
+    monkeypatch.setattr(settings, "TODO_OWNER_COMPAT_READS", compat_reads)
+    index = LIST_QUERY_INDEXES[combination]
+
+    stages, indexes = _plan(asyncio.run(_explain(owner, _query(*combination), index)))
+
+    assert "COLLSCAN" not in stages
+    assert "SORT" not in stages
+    expected = {index, legacy_index(index)} if compat_reads else {index}
+    assert indexes == expected
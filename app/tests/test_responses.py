@@ -0,0 +1,54 @@
+import asyncio
+import gzip
+from datetime import datetime
+from typing import List
+from uuid import uuid4
+
+import msgpack
+import pytest
+from starlette.requests import Request
+
+from api import responses
+from core.config import settings
+from schemas.todo_schema import TodoDetail
+
+
+# Negociação de formato/compressão da listagem (api/responses.py), sem MongoDB.
+
+
+def _todos(count: int) -> List[dict]:
+    now = datetime(2025, 1, 1)
+    return [
+        {"todo_id": uuid4(), "title": f"tarefa {i}", "description": "descrição " * 5, "status": bool(i % 2),
+         "created_at": now, "update_at": now, "owner_id": None}
+        for i in range(count)
+    ]
+
+
+def _request(accept: str, accept_encoding: str) -> Request:
+    headers = [(b"accept", accept.encode()), (b"accept-encoding", accept_encoding.encode())]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers})
+
+
+@pytest.mark.parametrize("count", [10, 500])
+def test_negotiated_response_gzip_msgpack(monkeypatch, count):
+    monkeypatch.setattr(settings, "RESPONSE_THREADPOOL_MIN_ITEMS", 100)
+    calls = []
+
+    async def run_in_threadpool(func, *args):
+        calls.append(func)
+        return func(*args)
+
+    monkeypatch.setattr(responses, "run_in_threadpool", run_in_threadpool)
+    todos = _todos(count)
+
+    response = asyncio.run(responses.negotiated_response(
+        _request(responses.MSGPACK_MEDIA_TYPE, "gzip"), todos, List[TodoDetail]
+    ))
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.media_type == responses.MSGPACK_MEDIA_TYPE
+    data = msgpack.unpackb(gzip.decompress(response.body))
+    assert [item["title"] for item in data] == [todo["title"] for todo in todos]
+    # Só as listas grandes saem do event loop
+    assert calls == ([responses.encode_response] if count >= 100 else [])
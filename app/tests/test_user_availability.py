@@ -0,0 +1,47 @@
+import asyncio
+from uuid import uuid4
+
+import pytest
+
+from core.config import settings
+from repositories import user_repository
+
+
+# GET /users/available com os filtros de Bloom de cada processo (repositórios em memória).
+
+
+def _identity():
+    name = f"user{uuid4().hex[:12]}"
+    return name, f"{name}@example.com"
+
+
+async def _create_on_other_worker(username: str, email: str) -> None:
+    # Grava direto no repositório, sem passar pelo UserService deste processo
+    await user_repository.create({"username": username, "email": email, "hash_password": "x"})
+
+
+def _available(client, username, email):
+    response = client.get("/api/v1/users/available", params={"username": username, "email": email})
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_user_created_here_is_taken(client):
+    username, email = _identity()
+    client.post("/api/v1/users/create", json={"email": email, "username": username, "password": "12345"})
+
+    assert _available(client, username, email) == {"username": False, "email": False}
+
+
+@pytest.mark.parametrize("interval", [0.0, 0.2])
+def test_user_created_on_other_worker_is_taken(client, monkeypatch, interval):
+    monkeypatch.setattr(settings, "BLOOM_SYNC_INTERVAL", interval)
+    username, email = _identity()
+    assert _available(client, username, email) == {"username": True, "email": True}
+
+    client.portal.call(_create_on_other_worker, username, email)
+    if interval:
+        # Dentro do intervalo o filtro ainda pode responder "livre"; depois dele, não
+        client.portal.call(asyncio.sleep, interval)
+
+    assert _available(client, username, email) == {"username": False, "email": False}